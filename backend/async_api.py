@@ -0,0 +1,66 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from cache import read_cache
+from database import get_async_session
+from pagination import DEFAULT_LIMIT, MAX_LIMIT, page_query, page_result
+
+# ----------------- نسخه async عملیات CRUD -----------------
+# وقتی DB_ASYNC=1 باشد این مسیرها زیر پیشوند /async در کنار مسیرهای sync اضافه می‌شوند.
+
+
+def crud_router(path, model, schema, pk, sortable, filters_dependency, label):
+    # imported here because main.py includes these routers at the end of its own import
+    from main import delete_item as delete_statement, insert_item, save_item
+
+    router = APIRouter()
+
+    async def write(session, fn):
+        # fn(session) is the same INSERT/UPDATE/DELETE ... RETURNING write the sync handlers run
+        result = await session.run_sync(fn)
+        await session.commit()
+        return result
+
+    @router.post(f"/{path}/")
+    async def create(item: schema, session: AsyncSession = Depends(get_async_session)):
+        data = item.model_dump()
+        result = await write(session, insert_item(model, data, label))
+        read_cache.invalidate(model.__tablename__, [data[pk]])
+        return result
+
+    @router.get(f"/{path}/")
+    async def list_items(
+        filters: dict = Depends(filters_dependency),
+        order_by: Optional[str] = None,
+        desc: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        session: AsyncSession = Depends(get_async_session),
+    ):
+        stmt, key_cols, order_by = page_query(model, pk, sortable, filters, order_by, desc, cursor, limit)
+        rows = (await session.exec(stmt)).all()
+        return page_result(rows, key_cols, order_by, desc, limit)
+
+    @router.get(f"/{path}/{{item_id}}")
+    async def get_item(item_id: str, session: AsyncSession = Depends(get_async_session)):
+        item = await session.get(model, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        return item
+
+    @router.put(f"/{path}/{{item_id}}")
+    async def update_item(item_id: str, new_data: schema, session: AsyncSession = Depends(get_async_session)):
+        data = new_data.model_dump()
+        result = await write(session, save_item(model, item_id, data, label))
+        read_cache.invalidate(model.__tablename__, [item_id, data[pk]])
+        return result
+
+    @router.delete(f"/{path}/{{item_id}}")
+    async def delete_item(item_id: str, session: AsyncSession = Depends(get_async_session)):
+        await write(session, delete_statement(model, item_id, label))
+        read_cache.invalidate(model.__tablename__, [item_id])
+        return {"message": f"{label} deleted successfully"}
+
+    return router
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session
+
+from database import write_engine
+from validation import validate_batch
+from versions import bump_version
+
+# ----------------- ورود گروهی داده‌ها -----------------
+
+BULK_CHUNK_SIZE = 5000
+BULK_MODES = ("insert", "upsert", "skip")
+# SQLite's default host parameter limit is 999 on older builds
+LOOKUP_CHUNK_SIZE = 500
+
+
+def parse_records(body, content_type):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+
+    if content_type in ("text/csv", "application/csv"):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    try:
+        if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            records = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of records")
+    return records
+
+
+def validate_records(rules, records):
+    failures = validate_batch(rules, records)
+    failed = {index for index, _ in failures}
+    valid = [(index, {field: record[field] for field in rules})
+             for index, record in enumerate(records) if index not in failed]
+    errors = [{"row": index, "errors": [{"field": field, "message": message} for field, message in field_errors.items()]}
+              for index, field_errors in failures]
+    return valid, errors
+
+
+def existing_keys(session, table, pk, keys):
+    found = set()
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(session.execute(select(table.c[pk]).where(table.c[pk].in_(chunk))).scalars())
+    return found
+
+
+def upsert_statement(table):
+    # INSERT ... ON CONFLICT DO UPDATE; a row identical to the stored one is not rewritten, so re-imports
+    # do not fire the update triggers or bump the table version
+    stmt = insert(table)
+    columns = [column for column in table.c if not column.primary_key]
+    return stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={column.name: stmt.excluded[column.name] for column in columns},
+        where=or_(*(column.is_distinct_from(stmt.excluded[column.name]) for column in columns)),
+    )
+
+
+def duplicate_error(index, pk, key):
+    return {"row": index, "errors": [{"field": pk, "message": f"Duplicate {pk}: {key}"}]}
+
+
+def bulk_import(engine, model, rules, pk, records, mode="insert", chunk_size=BULK_CHUNK_SIZE):
+    """mode: insert reports existing keys as errors, skip leaves them untouched, upsert overwrites them."""
+    if mode not in BULK_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(BULK_MODES)}")
+    table = model.__table__
+    valid, errors = validate_records(rules, records)
+    statement = upsert_statement(table) if mode == "upsert" else insert(table).on_conflict_do_nothing()
+
+    inserted = updated = skipped = 0
+    seen = set()
+    # the key lookup and the insert share a transaction, so it must hold the write lock from its start
+    with Session(write_engine(engine)) as session:
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            taken = existing_keys(session, table, pk, [row[pk] for _, row in chunk])
+            rows = []
+            new = 0
+            for index, row in chunk:
+                key = row[pk]
+                if key in seen:
+                    errors.append(duplicate_error(index, pk, key))
+                    continue
+                seen.add(key)
+                if key not in taken:
+                    new += 1
+                elif mode == "insert":
+                    errors.append(duplicate_error(index, pk, key))
+                    continue
+                elif mode == "skip":
+                    skipped += 1
+                    continue
+                rows.append(row)
+            if rows:
+                # one executemany and one commit per chunk instead of one per row
+                changed = session.execute(statement, rows).rowcount
+                if changed:
+                    bump_version(session, table.name)
+                session.commit()
+                inserted += new
+                updated += changed - new
+                skipped += len(rows) - changed
+
+    errors.sort(key=lambda e: e["row"])
+    return {"received": len(records), "inserted": inserted, "updated": updated, "skipped": skipped,
+            "failed": len(errors), "errors": errors}
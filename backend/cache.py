@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ----------------- کش خواندن درون پردازه -----------------
+# کلیدها به شکل (جدول، "item"، شناسه) برای یک رکورد و (جدول، "list"، پارامترها) برای صفحه‌های لیست هستند.
+# هر مقدار همراه نسخه جدول (table_version) در زمان خواندنش ذخیره می‌شود و با نسخه‌ای که درخواست فعلی از
+# پایگاه‌داده خوانده مقایسه می‌شود؛ پس نوشتن در هر worker دیگری هم بلافاصله کش این worker را بی‌اعتبار می‌کند.
+# invalidate فقط کلیدهای کهنه را زودتر آزاد می‌کند و TTL فقط حافظه را محدود نگه می‌دارد.
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "10000"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+
+MISSING = object()
+
+
+class ReadCache:
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL, enabled=CACHE_ENABLED):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self.entries = OrderedDict()
+        # table -> keys of its cached list pages, so a write drops exactly those
+        self.list_keys = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        if not self.enabled:
+            return MISSING
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            # an entry read at another table version is stale, whichever worker wrote since
+            if entry is None or entry[0] < now or entry[1] != version:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value, version):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, version, value)
+            self.entries.move_to_end(key)
+            if key[1] == "list":
+                self.list_keys.setdefault(key[0], set()).add(key)
+            while len(self.entries) > self.maxsize:
+                oldest = next(iter(self.entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, table, item_ids=()):
+        with self.lock:
+            for item_id in item_ids:
+                if self._drop((table, "item", str(item_id))):
+                    self.invalidations += 1
+            for key in self.list_keys.pop(table, ()):
+                if self.entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.list_keys.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key):
+        if self.entries.pop(key, None) is None:
+            return False
+        if key[1] == "list":
+            keys = self.list_keys.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+        return True
+
+
+def item_key(table, item_id):
+    return (table, "item", str(item_id))
+
+
+def list_key(table, **params):
+    return (table, "list", tuple(sorted(params.items())))
+
+
+read_cache = ReadCache()
@@ -0,0 +1,146 @@
+import fcntl
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+# ----------------- تنظیمات پایگاه‌داده -----------------
+# DB_PROFILE=legacy همان رفتار قبلی است (rollback journal و تنظیمات پیش‌فرض) و برای مقایسه نگه داشته شده است.
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:////app/univercity.db")
+DB_PROFILE = os.getenv("DB_PROFILE", "wal")
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+
+PROFILES = {
+    "legacy": {},
+    "wal": {
+        "journal_mode": "WAL",
+        # safe with WAL: a crash can lose the last transactions but never corrupts the database
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        # negative values are KiB rather than pages
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+POOL_DEFAULTS = {"pool_size": 8, "max_overflow": 8, "pool_timeout": 10}
+
+
+def profile_pragmas(profile):
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}; expected one of: {', '.join(PROFILES)}")
+    pragmas = dict(PROFILES[profile])
+    # any pragma can be overridden per deployment, e.g. DB_PRAGMA_CACHE_SIZE=-256000
+    for name in pragmas:
+        override = os.getenv(f"DB_PRAGMA_{name.upper()}")
+        if override is not None:
+            pragmas[name] = override
+    return pragmas
+
+
+def install_pragmas(engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def install_transaction_fix(engine):
+    # pysqlite begins transactions lazily on its own, which breaks SAVEPOINT/RELEASE;
+    # let SQLAlchemy emit BEGIN itself so nested transactions really nest
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        # a deferred transaction that reads and then writes fails with SQLITE_BUSY_SNAPSHOT (not retried by
+        # busy_timeout) if another connection committed in between; writers take the write lock up front
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if conn.get_execution_options().get("sqlite_immediate") else "BEGIN")
+
+
+def write_engine(engine):
+    # same pool and events; transactions on it start with BEGIN IMMEDIATE under the wal profile
+    return engine.execution_options(sqlite_immediate=True)
+
+
+def pool_options():
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", POOL_DEFAULTS["pool_size"])),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", POOL_DEFAULTS["max_overflow"])),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", POOL_DEFAULTS["pool_timeout"])),
+    }
+
+
+def make_engine(url=None, profile=None):
+    url = url or DATABASE_URL
+    profile = profile or DB_PROFILE
+    pragmas = profile_pragmas(profile)
+    if not pragmas:
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": int(pragmas.get("busy_timeout", 5000)) / 1000,
+        },
+        **pool_options(),
+    )
+    install_pragmas(engine, pragmas)
+    install_transaction_fix(engine)
+    return engine
+
+
+def make_async_engine(url=None, profile=None):
+    # aiosqlite is only needed when DB_ASYNC is enabled
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url or DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    pragmas = profile_pragmas(profile or DB_PROFILE)
+    options = pool_options() if pragmas else {}
+    engine = create_async_engine(url, connect_args={"check_same_thread": False}, **options)
+    if pragmas:
+        install_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+@contextmanager
+def schema_lock(engine):
+    # several worker processes may start at once (uvicorn --workers); only one may run DDL at a time
+    path = engine.url.database
+    if not path or path == ":memory:":
+        yield
+        return
+    with open(f"{path}.init.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+engine = make_engine()
+
+
+def get_session():
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async_engine = make_async_engine() if DB_ASYNC else None
+
+
+async def get_async_session():
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: only needed for format=arrow|parquet
+    pyarrow = None
+
+# ----------------- خروجی جریانی (Streaming) -----------------
+# همه قالب‌ها دسته‌به‌دسته از cursor ساخته و ارسال می‌شوند؛ کل جدول هیچ‌وقت در حافظه نیست.
+# arrow و parquet ستونی هستند و مستقیم با pyarrow یا pandas.read_parquet بدون پارس JSON خوانده می‌شوند.
+
+EXPORT_BATCH_SIZE = 1000
+# columnar batches are larger so that each Arrow batch / Parquet row group is worth its metadata
+COLUMNAR_BATCH_SIZE = 65536
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_rows(engine, model, pk, filters=None, batch_size=EXPORT_BATCH_SIZE):
+    table = model.__table__
+    stmt = select(table).order_by(table.c[pk])
+    for column, value in (filters or {}).items():
+        if value is not None:
+            stmt = stmt.where(table.c[column] == value)
+    # a dedicated connection, because the request's session is gone by the time the body is streamed
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for partition in result.partitions():
+            yield partition
+
+
+def ndjson_chunks(columns, batches):
+    for batch in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in batch).encode("utf-8")
+
+
+def csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def record_batch(schema, batch):
+    # rows -> columns in one pass; every column of these tables is text
+    columns = list(zip(*batch))
+    return pyarrow.RecordBatch.from_arrays([pyarrow.array(column, pyarrow.string()) for column in columns],
+                                          schema=schema)
+
+
+def drain(sink):
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def arrow_chunks(columns, batches):
+    schema = pyarrow.schema([(name, pyarrow.string()) for name in columns])
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(record_batch(schema, batch))
+            yield drain(sink)
+    yield drain(sink)
+
+
+def parquet_chunks(columns, batches):
+    schema = pyarrow.schema([(name, pyarrow.string()) for name in columns])
+    sink = io.BytesIO()
+    with pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            # one row group per batch; the footer is written when the writer is closed
+            writer.write_batch(record_batch(schema, batch))
+            yield drain(sink)
+    yield drain(sink)
+
+
+CHUNKERS = {"ndjson": ndjson_chunks, "csv": csv_chunks, "arrow": arrow_chunks, "parquet": parquet_chunks}
+
+
+def export_response(engine, model, pk, name, fmt, filters=None):
+    if fmt not in CHUNKERS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(CHUNKERS)}")
+    columnar = fmt in ("arrow", "parquet")
+    if columnar and pyarrow is None:
+        raise HTTPException(status_code=501, detail=f"format={fmt} requires pyarrow on the server")
+    columns = [column.name for column in model.__table__.c]
+    batches = iter_rows(engine, model, pk, filters, COLUMNAR_BATCH_SIZE if columnar else EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        CHUNKERS[fmt](columns, batches),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
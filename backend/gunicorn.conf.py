@@ -0,0 +1,24 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+# ----------------- اجرای چندپردازه‌ای با gunicorn + uvicorn -----------------
+# gunicorn -c gunicorn.conf.py main:app
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+# each worker imports the app (and opens its own connections) after the fork; the master never imports main
+preload_app = False
+
+
+def on_starting(server):
+    # create the schema once instead of racing create_db() in every worker; it runs in a child process so that
+    # main (its engine, cache and app) is not imported into the master and inherited by every fork
+    subprocess.run([sys.executable, "-c", "import main; main.create_db()"],
+                   cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    os.environ["DB_SCHEMA_READY"] = "1"
@@ -1,10 +1,52 @@
-from fastapi import FastAPI, HTTPException, Depends
-from sqlmodel import SQLModel, Field, Session, create_engine, select
-from pydantic import BaseModel, field_validator
-import re
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Index, delete, func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, Field, Session, select
+from pydantic import BaseModel, create_model, field_validator
+from typing import Optional
+import os
+
+from bulk import LOOKUP_CHUNK_SIZE, bulk_import, parse_records, upsert_statement
+from cache import MISSING, item_key, list_key, read_cache
+from database import DB_ASYNC, async_engine, engine, get_session, schema_lock
+from export import export_response
+from metrics import METRICS_ENABLED, TimingMiddleware, install_query_timing, metrics_response
+from pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate
+from responses import FastJSONResponse, install_compression, json_response
+from search import install_search, match_clause, match_expression, search
+from stats import install_stats, read_stats
+from validation import (COURSE_RULES, MAJOR_DEPARTMENT, MAJORS, PROFESSOR_RULES, STUDENT_RULES, check_field,
+                        validate_record)
+from versions import bump_version, conditional_response, read_version
+from writer import run_write, start_writer, stop_writer
 
 # ----------------- مدل Pydantic -----------------
 
+def apply_rule(rules, v, info):
+    error = check_field(rules, info.field_name, v, info.data)
+    if error:
+        raise ValueError(error)
+    return v
+
+def apply_partial_rule(rules, v, info):
+    # without Department in the body only check that Major exists; update_item checks it against the stored row
+    if info.field_name == "Major" and info.data.get("Department") is None:
+        if v not in MAJOR_DEPARTMENT:
+            raise ValueError("رشته وارد شده معتبر نیست.")
+        return v
+    return apply_rule(rules, v, info)
+
+def partial_schema(schema, rules):
+    # same fields as schema, all optional, for PATCH bodies
+    return create_model(
+        f"{schema.__name__}Patch",
+        __validators__={"validate_field": field_validator("*")(lambda cls, v, info: apply_partial_rule(rules, v, info))},
+        **{name: (str, None) for name in schema.model_fields},
+    )
+
+
 class StudentBase(BaseModel):
     STID: str
     Fname: str
@@ -22,121 +64,23 @@ class StudentBase(BaseModel):
     Id: str
     Married: str
 
-    @field_validator("STID")
-    def validate_stid(cls, v):
-        if not re.fullmatch(r"\d{3}114150\d{2}", v):
-            raise ValueError("شماره دانشجویی باید یک عدد ۱۱ رقمی معتبر مانند 40311415001 باشد.")
-        return v
-
-    @field_validator("Fname", "Lname", "Father")
-    def validate_persian_names(cls, v):
-        if len(v) > 10:
-            raise ValueError("نام‌ها نباید بیشتر از ۱۰ کاراکتر باشند.")
-        if not re.fullmatch(r"^[آ-ی\s]+$", v):
-            raise ValueError("نام باید فقط شامل حروف فارسی باشد.")
-        return v
-
-    @field_validator("BIRTH")
-    def validate_birth(cls, v):
-        if not re.fullmatch(r"\d{4}/\d{2}/\d{2}", v):
-            raise ValueError("تاریخ تولد باید در قالب YYYY/MM/DD وارد شود.")
-        year, month, day = map(int, v.split("/"))
-        if not (1300 <= year <= 1404):
-            raise ValueError("سال باید بین 1300 تا 1404 باشد.")
-        if not (1 <= month <= 12):
-            raise ValueError("ماه باید بین 1 تا 12 باشد.")
-        if month <= 6 and not (1 <= day <= 31):
-            raise ValueError("روز باید بین 1 تا 31 باشد.")
-        elif month > 6 and not (1 <= day <= 30):
-            raise ValueError("روز باید بین 1 تا 30 باشد.")
-        return v
-
-    @field_validator("ids")
-    def validate_ids(cls, v):
-        if not re.fullmatch(r"\d{6}[آ-ی]\d{2}", v):
-            raise ValueError("شناسه باید شامل عدد ۶ رقمی، یک حرف فارسی، و عدد ۲ رقمی باشد.")
-        return v
-
-    @field_validator("Borncity")
-    def validate_borncity(cls, v):
-        provinces = ["تهران", "اصفهان", "مشهد", "شیراز", "تبریز", "کرمان", "اهواز", "کرج", "رشت", "یزد", "ارومیه",
-                     "قم", "ساری", "بندرعباس", "زاهدان", "سنندج", "قزوین", "بوشهر","خرم آباد", "اردبیل", "همدان",
-                     "گرگان", "ایلام", "یاسوج", "بجنورد", "زنجان"]
-        if v not in provinces:
-            raise ValueError("محل تولد باید یکی از مراکز استان کشور باشد.")
-        return v
-
-    @field_validator("Address")
-    def validate_address(cls, v):
-        if len(v) > 100:
-            raise ValueError("آدرس نباید بیشتر از ۱۰۰ کاراکتر باشد.")
-        return v
-
-    @field_validator("Postalcode")
-    def validate_postalcode(cls, v):
-        if not re.fullmatch(r"\d{10}", v):
-            raise ValueError("کد پستی باید یک عدد ۱۰ رقمی باشد.")
-        return v
-
-    @field_validator("Cphone")
-    def validate_cphone(cls, v):
-        if not re.fullmatch(r"98\d{10}", v):
-            raise ValueError(".شماره موبایل باید با 98 شروع شود و بجز 98 شامل 10 رقم عددی باشد")
-        return v
-
-    @field_validator("Hphone")
-    def validate_hphone(cls, v):
-        if not re.fullmatch(r"0\d{2,3}\d{8}", v):
-            raise ValueError("شماره تلفن ثابت باید با 0 شروع شود و شامل کد شهر (۲ یا ۳ رقمی) و شماره ۸ رقمی باشد.")
-        return v
-
-    @field_validator("Department")
-    def validate_department(cls, v):
-        valid_departments = ["علوم پایه","کشاورزی", "اقتصاد", "فنی و مهندسی"]
-        if v not in valid_departments:
-            raise ValueError("دانشکده باید یکی از موارد کشاورزی، اقتصاد، فنی و مهندسی ، علوم پایه باشد.")
-        return v
-
-    @field_validator("Major")
-    def validate_major(cls, v, info):
-        department = info.data.get("Department")
-        if department == "فنی و مهندسی":
-            valid_majors = ["مهندسی برق","مهندسی کامپیوتر", "مهندسی عمران", "مهندسی پلیمر", "مهندسی مکانیک", "مهندسی معدن"]
-        elif department == "کشاورزی":
-            valid_majors = ["باغبانی", "مهندسی کشاورزی", "علوم دام"]
-        elif department == "اقتصاد":
-            valid_majors = ["حسابداری", "مدیریت", "مدیریت مالی", "مدیریت بازرگانی"]
-        elif department=="علوم پایه":
-            valid_majors=["شیمی","زمین شناسی","علوم کامپیوتر","ریاضی","فیزیک"]
-        else:
-            raise ValueError("لطفاً ابتدا دانشکده معتبری وارد کنید.")
-        if v not in valid_majors:
-            raise ValueError(f"رشته وارد شده با دانشکده انتخاب‌شده مطابقت ندارد. رشته‌های مجاز: {', '.join(valid_majors)}")
-        return v
-
-    @field_validator("Married")
-    def validate_married(cls, v):
-        if v not in ["مجرد", "متاهل"]:
-            raise ValueError("وضعیت تأهل فقط می‌تواند مجرد یا متاهل باشد.")
-        return v
-#hi
-    @field_validator("Id")
-    def validate_national_id(cls, v):
-        if not re.fullmatch(r"\d{10}", v):
-            raise ValueError("کد ملی باید ۱۰ رقمی باشد.")
-        check = sum(int(v[i]) * (10 - i) for i in range(9)) % 11
-        last_digit = int(v[9])
-        if (check < 2 and last_digit != check) or (check >= 2 and last_digit != (11 - check)):
-            raise ValueError("کد ملی نامعتبر است.")
-        return v
+    @field_validator("*")
+    def validate_field(cls, v, info):
+        return apply_rule(STUDENT_RULES, v, info)
 
 class person(SQLModel,table=False):
     Fname: str
     Lname: str
-class Student(SQLModel,person,table=True):
+class Student(person,table=True):
+    # the primary key is the last index column so filtered keyset pages are read in index order
+    __table_args__ = (
+        Index("ix_student_department_major", "Department", "Major", "STID"),
+        Index("ix_student_borncity", "Borncity", "STID"),
+    )
+
     STID: str = Field(primary_key=True, index=True)
     ids:str
-    borncity:str
+    Borncity:str
     Father: str
     BIRTH: str
     Address: str
@@ -161,95 +105,17 @@ class ProfessorBase(BaseModel):
     Cphone: str
     Hphone: str
 
-    @field_validator("LID")
-    def validate_lid(cls, v):
-        if not re.fullmatch(r"\d{6}", v):
-            raise ValueError("کد استاد باید یک عدد ۶ رقمی باشد.")
-        return v
+    @field_validator("*")
+    def validate_field(cls, v, info):
+        return apply_rule(PROFESSOR_RULES, v, info)
 
-    @field_validator("Fname", "Lname")
-    def validate_persian_names(cls, v):
-        if len(v) > 10:
-            raise ValueError("نام‌ها نباید بیشتر از ۱۰ کاراکتر باشند.")
-        if not re.fullmatch(r"^[آ-ی\s]+$", v):
-            raise ValueError("نام باید فقط شامل حروف فارسی باشد.")
-        return v
 
-    @field_validator("Department")
-    def validate_department(cls, v):
-        valid_departments = ["علوم پایه","کشاورزی", "اقتصاد", "فنی و مهندسی"]
-        if v not in valid_departments:
-            raise ValueError("دانشکده باید یکی از موارد کشاورزی، اقتصاد، فنی و مهندسی ، علوم پایه باشد.")
-        return v
-
-    @field_validator("Major")
-    def validate_major(cls, v, info):
-        department = info.data.get("Department")
-        if department == "فنی و مهندسی":
-            valid_majors = ["مهندسی برق","مهندسی کامپیوتر", "مهندسی عمران", "مهندسی پلیمر", "مهندسی مکانیک", "مهندسی معدن"]
-        elif department == "کشاورزی":
-            valid_majors = ["باغبانی", "مهندسی کشاورزی", "علوم دام"]
-        elif department == "اقتصاد":
-            valid_majors = ["حسابداری", "مدیریت", "مدیریت مالی", "مدیریت بازرگانی"]
-        elif department=="علوم پایه":
-            valid_majors=["علوم کامپیوتر","شیمی","زمین شناسی","فیزیک","ریاضی"]
-        else:
-            raise ValueError("لطفاً ابتدا دانشکده معتبری وارد کنید.")
-
-        if v not in valid_majors:
-            raise ValueError(f"رشته وارد شده با دانشکده انتخاب‌شده مطابقت ندارد. رشته‌های مجاز: {', '.join(valid_majors)}")
-        return v
-
-    @field_validator("Borncity")
-    def validate_borncity(cls, v):
-        provinces = ["تهران", "اصفهان", "مشهد", "شیراز", "تبریز", "کرمان", "اهواز", "کرج", "رشت", "یزد", "ارومیه",
-                     "قم", "ساری", "بندرعباس", "زاهدان", "سنندج", "قزوین", "بوشهر","خرم آباد", "اردبیل", "همدان",
-                     "گرگان", "ایلام", "یاسوج", "بجنورد", "زنجان"]
-        if v not in provinces:
-            raise ValueError("محل تولد باید یکی از مراکز استان کشور باشد.")
-        return v
+class Professor(person,table=True):
+    __table_args__ = (
+        Index("ix_professor_department_major", "Department", "Major", "LID"),
+        Index("ix_professor_borncity", "Borncity", "LID"),
+    )
 
-    @field_validator("Birth")
-    def validate_birth(cls, v):
-        if not re.fullmatch(r"\d{4}/\d{2}/\d{2}", v):
-            raise ValueError("تاریخ تولد باید در قالب YYYY/MM/DD وارد شود.")
-        year, month, day = map(int, v.split("/"))
-        if not (1300 <= year <= 1404):
-            raise ValueError("سال باید بین 1300 تا 1404 باشد.")
-        if not (1 <= month <= 12):
-            raise ValueError("ماه باید بین 1 تا 12 باشد.")
-        if month <= 6 and not (1 <= day <= 31):
-            raise ValueError("روز باید بین 1 تا 31 باشد.")
-        elif month > 6 and not (1 <= day <= 30):
-            raise ValueError("روز باید بین 1 تا 30 باشد.")
-        return v
-
-    @field_validator("Address")
-    def validate_address(cls, v):
-        if len(v) > 100:
-            raise ValueError("آدرس نباید بیشتر از ۱۰۰ کاراکتر باشد.")
-        return v
-
-    @field_validator("Postalcode")
-    def validate_postalcode(cls, v):
-        if not re.fullmatch(r"\d{10}", v):
-            raise ValueError("کد پستی باید یک عدد ۱۰ رقمی باشد.")
-        return v
-
-    @field_validator("Cphone")
-    def validate_cphone(cls, v):
-        if not re.fullmatch(r"98\d{10}", v):
-            raise ValueError(".شماره موبایل باید با 98 شروع شود و بجز 98 شامل 10 رقم عددی باشد")
-        return v
-
-    @field_validator("Hphone")
-    def validate_hphone(cls, v):
-        if not re.fullmatch(r"0\d{2,3}\d{8}", v):
-            raise ValueError("شماره تلفن ثابت باید با 0 شروع شود و شامل کد شهر (۲ یا ۳ رقمی) و شماره ۸ رقمی باشد.")
-        return v
-    
-
-class Professor(SQLModel,person,table=True):
     LID: str = Field(index=True, primary_key=True)
     Department: str
     Major: str
@@ -259,7 +125,6 @@ class Professor(SQLModel,person,table=True):
     Postalcode: str
     Cphone: str
     Hphone: str
-VALID_DEPARTMENTS = ["علوم پایه","کشاورزی", "اقتصاد", "فنی و مهندسی"]
 
 # --------- اعتبارسنجی داده‌ها با Pydantic ---------
 class CourseBase(BaseModel):
@@ -268,181 +133,591 @@ class CourseBase(BaseModel):
     Department: str
     Credit: str
 
-    @field_validator("CID")
-    def validate_cid(cls, v):
-        if not v.isdigit():
-            raise ValueError("کد درس باید فقط شامل ارقام باشد.")
-        cid = int(v)
-        if not (10000 <= cid <= 99999):
-            raise ValueError("کد درس باید یک عدد ۵ رقمی باشد.")
-        return v
+    @field_validator("*")
+    def validate_field(cls, v, info):
+        return apply_rule(COURSE_RULES, v, info)
 
-    @field_validator("CName")
-    def validate_cname(cls, v):
-        if len(v) > 25:
-            raise ValueError("نام درس نباید بیشتر از ۲۵ کاراکتر باشد.")
-        if not re.fullmatch(r"^[آ-ی\s]+$", v):
-            raise ValueError("نام درس باید فقط شامل حروف فارسی باشد.")
-        return v
+class IdList(BaseModel):
+    ids: list[str]
 
-    @field_validator("Department")
-    def validate_department(cls, v):
-        if v not in VALID_DEPARTMENTS:
-            raise ValueError("دانشکده باید یکی از موارد کشاورزی، اقتصاد، فنی و مهندسی ، علوم پایه باشد.")
-        return v
-
-    @field_validator("Credit")
-    def validate_credit(cls, v):
-        if not v.isdigit():
-            raise ValueError("تعداد واحد باید عدد باشد.")
-        credit = int(v)
-        if credit not in [1, 2, 3, 4]:
-            raise ValueError("تعداد واحد باید عددی بین ۱ تا ۴ باشد.")
-        return v
+StudentPatch = partial_schema(StudentBase, STUDENT_RULES)
+ProfessorPatch = partial_schema(ProfessorBase, PROFESSOR_RULES)
+CoursePatch = partial_schema(CourseBase, COURSE_RULES)
 
 # --------- مدل پایگاه‌داده با SQLModel ---------
 class Course(SQLModel, table=True):
+    __table_args__ = (Index("ix_course_department", "Department", "CID"),)
+
     CID: str = Field(primary_key=True)
     CName: str = Field(index=True)
     Department: str
     Credit: str
-sqlite_url = "sqlite:////app/univercity.db"
-engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
 
 def create_db():
-    SQLModel.metadata.create_all(engine)
-
-def get_session():
-    session = Session(engine)
-    try:
-        yield session
-    finally:
-        session.close()
+    # under gunicorn the master has already created the schema before forking (see gunicorn.conf.py)
+    if os.getenv("DB_SCHEMA_READY") == "1":
+        return
+    with schema_lock(engine):
+        SQLModel.metadata.create_all(engine)
+        # create_all skips tables that already exist, so indexes added later are created here
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        install_search(engine)
+        install_stats(engine)
+
+
+# ----------------- عملیات نوشتن -----------------
+# هر تابع یک عمل نوشتن بر روی session برمی‌گرداند تا از طریق صف نوشتن (writer.py) یا مستقیم اجرا شود.
+# نتیجه داخل همان تراکنش به dict تبدیل می‌شود چون session پس از commit گروهی در دسترس فراخوان نیست.
+
+def primary_key(model):
+    return next(iter(model.__table__.primary_key.columns))
+
+def insert_item(model, data, label):
+    # ON CONFLICT DO NOTHING: a duplicate key returns no row instead of raising IntegrityError
+    table = model.__table__
+    stmt = insert(table).values(**data).on_conflict_do_nothing().returning(*table.c)
+    def write(session):
+        row = session.execute(stmt).mappings().first()
+        if row is None:
+            raise HTTPException(status_code=409, detail=f"{label} already exists")
+        bump_version(session, model.__tablename__)
+        return dict(row)
+    return write
+
+def upsert_item(model, data):
+    table = model.__table__
+    stmt = upsert_statement(table).values(**data).returning(*table.c)
+    def write(session):
+        row = session.execute(stmt).mappings().first()
+        if row is None:
+            # identical to the stored row, nothing was written
+            return session.get(model, data[primary_key(model).name]).model_dump()
+        bump_version(session, model.__tablename__)
+        return dict(row)
+    return write
+
+def save_item(model, item_id, data, label):
+    # PUT to the row's own id is an idempotent upsert; a different id in the body renames the row
+    if data[primary_key(model).name] == str(item_id):
+        return upsert_item(model, data)
+    return update_item(model, item_id, data, label)
+
+def update_item(model, item_id, data, label, rules=None, conditions=()):
+    # one UPDATE ... RETURNING instead of loading the row, setting attributes and refreshing it
+    table = model.__table__
+    stmt = update(table).where(primary_key(model) == item_id, *conditions).values(**data).returning(*table.c)
+    def write(session):
+        try:
+            row = session.execute(stmt).mappings().first()
+        except IntegrityError:
+            # renamed to a key that is already taken
+            raise HTTPException(status_code=409, detail=f"{label} already exists")
+        if row is None:
+            current = session.get(model, item_id) if conditions else None
+            if current is None:
+                raise HTTPException(status_code=404, detail=f"{label} not found")
+            # the row exists, so a condition on a field that was not sent (e.g. Department for Major) failed
+            raise HTTPException(status_code=422, detail=validate_record(rules, {**current.model_dump(), **data}))
+        bump_version(session, model.__tablename__)
+        return dict(row)
+    return write
+
+def delete_item(model, item_id, label):
+    stmt = delete(model.__table__).where(primary_key(model) == item_id).returning(primary_key(model))
+    def write(session):
+        if session.execute(stmt).first() is None:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        bump_version(session, model.__tablename__)
+    return write
+
+def patch_data(patch):
+    data = patch.model_dump(exclude_unset=True)
+    if not data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    return data
+
+def person_conditions(model, data):
+    # a PATCH may send only one of Department/Major; the stored value of the other one must still match
+    if "Major" in data and "Department" not in data:
+        return [model.Department == MAJOR_DEPARTMENT[data["Major"]]]
+    if "Department" in data and "Major" not in data:
+        return [model.Major.in_(MAJORS[data["Department"]])]
+    return []
+
+def delete_items(model, ids):
+    pk = primary_key(model)
+    def write(session):
+        deleted = set()
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            stmt = delete(model.__table__).where(pk.in_(ids[start:start + LOOKUP_CHUNK_SIZE])).returning(pk)
+            deleted.update(session.execute(stmt).scalars())
+        if deleted:
+            bump_version(session, model.__tablename__)
+        return {"deleted": [item_id for item_id in ids if item_id in deleted],
+                "missing": [item_id for item_id in ids if item_id not in deleted]}
+    return write
+
+def write_and_invalidate(model, write, *item_ids):
+    result = run_write(engine, write)
+    read_cache.invalidate(model.__tablename__, item_ids)
+    return result
+
+def record_ids(records, pk):
+    return [record.get(pk) for record in records if isinstance(record, dict)]
+
+
+# ----------------- خواندن با کش -----------------
+
+def parse_fields(model, fields):
+    # ?fields=Fname,Lname -> ("STID", "Fname", "Lname"); the primary key is always returned
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in model.__table__.c]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys([primary_key(model).name, *names]))
+
+def read_item(session, version, model, item_id, label, fields=None):
+    # version is the table version read by conditional_response in this request's transaction
+    key = item_key(model.__tablename__, item_id)
+    item = read_cache.get(key, version)
+    if item is MISSING:
+        if fields:
+            # a projection selects only its columns and is not cached; the cache holds whole rows
+            row = session.execute(select(*(getattr(model, name) for name in fields))
+                                  .where(primary_key(model) == item_id)).mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail=f"{label} not found")
+            return dict(row)
+        row = session.get(model, item_id)
+        if not row:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        item = row.model_dump()
+        read_cache.set(key, item, version)
+    return {name: item[name] for name in fields} if fields else item
+
+MAX_BATCH_IDS = 5000
+
+def batch_ids(body):
+    ids = list(dict.fromkeys(body.ids))
+    if not ids or len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"ids must contain between 1 and {MAX_BATCH_IDS} values")
+    return ids
+
+def read_items(session, model, ids):
+    # cached rows first, the rest with one IN (...) query per chunk
+    table = model.__table__
+    pk = primary_key(model)
+    version = read_version(session, table.name)[0]
+    found = {}
+    pending = []
+    for item_id in ids:
+        item = read_cache.get(item_key(table.name, item_id), version)
+        if item is MISSING:
+            pending.append(item_id)
+        else:
+            found[item_id] = item
+    for start in range(0, len(pending), LOOKUP_CHUNK_SIZE):
+        stmt = select(table).where(pk.in_(pending[start:start + LOOKUP_CHUNK_SIZE]))
+        for row in session.execute(stmt).mappings():
+            item = dict(row)
+            found[item[pk.name]] = item
+            read_cache.set(item_key(table.name, item[pk.name]), item, version)
+    return {"items": [found[item_id] for item_id in ids if item_id in found],
+            "missing": [item_id for item_id in ids if item_id not in found]}
+
+def read_page(session, version, model, pk, sortable, filters, order_by, desc, cursor, limit, fields=None):
+    key = list_key(model.__tablename__, filters=tuple(sorted(filters.items())), order_by=order_by,
+                   desc=desc, cursor=cursor, limit=limit, fields=fields)
+    page = read_cache.get(key, version)
+    if page is MISSING:
+        page = paginate(session, model, pk, sortable, filters=filters, order_by=order_by, desc=desc,
+                        cursor=cursor, limit=limit, fields=fields)
+        if fields:
+            items = [{name: getattr(row, name) for name in fields} for row in page["items"]]
+        else:
+            items = [row.model_dump() for row in page["items"]]
+        page = {"items": items, "next_cursor": page["next_cursor"]}
+        read_cache.set(key, page, version)
+    return page
+
+def read_options(session, version, model, label_fields, filters, q=None, limit=DEFAULT_LIMIT):
+    # id/label pairs for pickers: three columns instead of the whole row
+    q = (q or "").strip()
+    key = list_key(model.__tablename__, options=True, filters=tuple(sorted(filters.items())), q=q, limit=limit)
+    options = read_cache.get(key, version)
+    if options is MISSING:
+        stmt = options_query(model, label_fields, filters, q, limit)
+        options = {"items": [{"id": row[0], "label": " ".join(row[1:])} for row in session.execute(stmt)]}
+        read_cache.set(key, options, version)
+    return options
+
+def options_query(model, label_fields, filters, q, limit):
+    pk = primary_key(model)
+    stmt = select(pk, *(getattr(model, name) for name in label_fields)).order_by(pk)
+    for column, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(getattr(model, column) == value)
+    if q.isdigit():
+        # id prefix as a range on the primary key index
+        stmt = stmt.where(pk >= q, pk < q + "\uffff")
+    elif expression := match_expression(q):
+        # a q that normalizes to nothing (a lone ZWNJ or tatweel) is treated like no q at all
+        stmt = stmt.where(match_clause(model.__tablename__, expression))
+    return stmt.limit(limit)
+
+
+# ----------------- فیلترهای لیست -----------------
+# هر رشته فقط در یک دانشکده است، پس اگر فقط رشته داده شود دانشکده را هم تعیین می‌کنیم تا
+# پرس‌وجو از ایندکس (Department, Major, ...) استفاده کند.
+
+def person_filters(department: Optional[str] = None, major: Optional[str] = None, borncity: Optional[str] = None):
+    if major is not None and department is None:
+        department = MAJOR_DEPARTMENT.get(major)
+    return {"Department": department, "Major": major, "Borncity": borncity}
+
+def course_filters(department: Optional[str] = None):
+    return {"Department": department}
+
+def count_query(model, filters):
+    stmt = select(func.count()).select_from(model)
+    for column, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(getattr(model, column) == value)
+    return stmt
+
+def count_rows(session, model, filters):
+    return {"count": session.exec(count_query(model, filters)).one()}
 
 
 # ----------------- اپلیکیشن FastAPI -----------------
 
-app = FastAPI(root_path="/api")
+app = FastAPI(root_path="/api", default_response_class=FastJSONResponse)
+install_compression(app)
+if METRICS_ENABLED:
+    app.add_middleware(TimingMiddleware)
+    install_query_timing(engine)
+    if async_engine is not None:
+        install_query_timing(async_engine.sync_engine)
 
 
 @app.on_event("startup")
 def on_startup():
     create_db()
+    start_writer(engine)
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_writer()
+
+@app.get("/metrics")
+def get_metrics():
+    return metrics_response(engine, read_cache.stats())
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    return read_cache.stats()
+
+@app.get("/search")
+def search_names(
+    q: str,
+    type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_session),
+):
+    return search(session, q, type, limit)
+
+@app.get("/stats")
+def get_stats(session: Session = Depends(get_session)):
+    return read_stats(session)
+
 @app.post("/students/")
-def create_student(student: StudentBase, session: Session = Depends(get_session)):
-    db_student = Student(**student.dict())
-    session.add(db_student)
-    session.commit()
-    session.refresh(db_student)
-    return db_student
+def create_student(student: StudentBase):
+    return write_and_invalidate(Student, insert_item(Student, student.dict(), "Student"), student.STID)
+
+@app.post("/students/bulk")
+async def bulk_create_students(request: Request, mode: str = "insert"):
+    records = parse_records(await request.body(), request.headers.get("content-type"))
+    result = await run_in_threadpool(bulk_import, engine, Student, STUDENT_RULES, "STID", records, mode)
+    read_cache.invalidate(Student.__tablename__, record_ids(records, "STID") if mode == "upsert" else ())
+    return result
+
+STUDENT_SORTABLE = ("STID", "Fname", "Lname", "Department", "Major", "Borncity", "BIRTH")
 
 @app.get("/students/")
-def get_students(session: Session = Depends(get_session)):
-    return session.exec(select(Student)).all()
+def get_students(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(person_filters),
+    order_by: Optional[str] = None,
+    desc: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Student.__tablename__)
+    if not_modified:
+        return not_modified
+    page = read_page(session, version, Student, "STID", STUDENT_SORTABLE, filters, order_by, desc, cursor, limit,
+                     parse_fields(Student, fields))
+    return json_response(page, response)
+
+@app.get("/students/options")
+def student_options(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(person_filters),
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Student.__tablename__)
+    if not_modified:
+        return not_modified
+    return json_response(read_options(session, version, Student, ("Fname", "Lname"), filters, q, limit), response)
+
+@app.post("/students/batch-get")
+def batch_get_students(body: IdList, response: Response, session: Session = Depends(get_session)):
+    return json_response(read_items(session, Student, batch_ids(body)), response)
+
+@app.post("/students/batch-delete")
+def batch_delete_students(body: IdList):
+    ids = batch_ids(body)
+    return write_and_invalidate(Student, delete_items(Student, ids), *ids)
+
+@app.get("/students/count")
+def count_students(filters: dict = Depends(person_filters), session: Session = Depends(get_session)):
+    return count_rows(session, Student, filters)
+
+@app.get("/students/export")
+def export_students(format: str = "ndjson", filters: dict = Depends(person_filters)):
+    return export_response(engine, Student, "STID", "students", format, filters=filters)
 
 @app.get("/students/{student_id}")
-def get_student(student_id: str, session: Session = Depends(get_session)):
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    return student
+def get_student(
+    student_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Student.__tablename__)
+    if not_modified:
+        return not_modified
+    return read_item(session, version, Student, student_id, "Student", parse_fields(Student, fields))
 
 @app.put("/students/{student_id}")
-def update_student(student_id: str, new_data: StudentBase, session: Session = Depends(get_session)):
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    for field, value in new_data.dict(exclude_unset=True).items():
-        setattr(student, field, value)
-    session.commit()
-    session.refresh(student)
-    return student
+def update_student(student_id: str, new_data: StudentBase):
+    return write_and_invalidate(Student, save_item(Student, student_id, new_data.dict(), "Student"),
+                                student_id, new_data.STID)
+
+@app.patch("/students/{student_id}")
+def patch_student(student_id: str, patch: StudentPatch):
+    data = patch_data(patch)
+    write = update_item(Student, student_id, data, "Student", STUDENT_RULES, person_conditions(Student, data))
+    return write_and_invalidate(Student, write, student_id, data.get("STID"))
 
 @app.delete("/students/{student_id}")
-def delete_student(student_id: str, session: Session = Depends(get_session)):
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    session.delete(student)
-    session.commit()
+def delete_student(student_id: str):
+    write_and_invalidate(Student, delete_item(Student, student_id, "Student"), student_id)
     return {"message": "Student deleted successfully"}
 @app.post("/professors/")
-def create_professor(professor: ProfessorBase, session: Session = Depends(get_session)):
-    db_professor = Professor(**professor.dict())
-    session.add(db_professor)
-    session.commit()
-    session.refresh(db_professor)
-    return db_professor
+def create_professor(professor: ProfessorBase):
+    return write_and_invalidate(Professor, insert_item(Professor, professor.dict(), "Professor"), professor.LID)
+
+@app.post("/professors/bulk")
+async def bulk_create_professors(request: Request, mode: str = "insert"):
+    records = parse_records(await request.body(), request.headers.get("content-type"))
+    result = await run_in_threadpool(bulk_import, engine, Professor, PROFESSOR_RULES, "LID", records, mode)
+    read_cache.invalidate(Professor.__tablename__, record_ids(records, "LID") if mode == "upsert" else ())
+    return result
+
+PROFESSOR_SORTABLE = ("LID", "Fname", "Lname", "Department", "Major", "Borncity", "Birth")
 
 @app.get("/professors/")
-def get_professors(session: Session = Depends(get_session)):
-    return session.exec(select(Professor)).all()
+def get_professors(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(person_filters),
+    order_by: Optional[str] = None,
+    desc: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Professor.__tablename__)
+    if not_modified:
+        return not_modified
+    page = read_page(session, version, Professor, "LID", PROFESSOR_SORTABLE, filters, order_by, desc, cursor, limit,
+                     parse_fields(Professor, fields))
+    return json_response(page, response)
+
+@app.get("/professors/options")
+def professor_options(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(person_filters),
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Professor.__tablename__)
+    if not_modified:
+        return not_modified
+    return json_response(read_options(session, version, Professor, ("Fname", "Lname"), filters, q, limit), response)
+
+@app.post("/professors/batch-get")
+def batch_get_professors(body: IdList, response: Response, session: Session = Depends(get_session)):
+    return json_response(read_items(session, Professor, batch_ids(body)), response)
+
+@app.post("/professors/batch-delete")
+def batch_delete_professors(body: IdList):
+    ids = batch_ids(body)
+    return write_and_invalidate(Professor, delete_items(Professor, ids), *ids)
+
+@app.get("/professors/count")
+def count_professors(filters: dict = Depends(person_filters), session: Session = Depends(get_session)):
+    return count_rows(session, Professor, filters)
+
+@app.get("/professors/export")
+def export_professors(format: str = "ndjson", filters: dict = Depends(person_filters)):
+    return export_response(engine, Professor, "LID", "professors", format, filters=filters)
 
 @app.get("/professors/{professor_id}")
-def get_professor(professor_id: str, session: Session = Depends(get_session)):
-    professor = session.get(Professor, professor_id)
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    return professor
+def get_professor(
+    professor_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Professor.__tablename__)
+    if not_modified:
+        return not_modified
+    return read_item(session, version, Professor, professor_id, "Professor", parse_fields(Professor, fields))
 
 @app.put("/professors/{professor_id}")
-def update_professor(professor_id: str, new_data: ProfessorBase, session: Session = Depends(get_session)):
-    professor = session.get(Professor, professor_id)
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    for field, value in new_data.dict(exclude_unset=True).items():
-        setattr(professor, field, value)
-    session.commit()
-    session.refresh(professor)
-    return professor
+def update_professor(professor_id: str, new_data: ProfessorBase):
+    return write_and_invalidate(Professor, save_item(Professor, professor_id, new_data.dict(), "Professor"),
+                                professor_id, new_data.LID)
+
+@app.patch("/professors/{professor_id}")
+def patch_professor(professor_id: str, patch: ProfessorPatch):
+    data = patch_data(patch)
+    write = update_item(Professor, professor_id, data, "Professor", PROFESSOR_RULES, person_conditions(Professor, data))
+    return write_and_invalidate(Professor, write, professor_id, data.get("LID"))
 
 @app.delete("/professors/{professor_id}")
-def delete_professor(professor_id: str, session: Session = Depends(get_session)):
-    professor = session.get(Professor, professor_id)
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    session.delete(professor)
-    session.commit()
+def delete_professor(professor_id: str):
+    write_and_invalidate(Professor, delete_item(Professor, professor_id, "Professor"), professor_id)
     return {"message": "Professor deleted successfully"}
 @app.post("/courses/")
-def create_course(course: CourseBase, session: Session = Depends(get_session)):
-    db_course = Course(**course.dict())
-    session.add(db_course)
-    session.commit()
-    session.refresh(db_course)
-    return db_course
+def create_course(course: CourseBase):
+    return write_and_invalidate(Course, insert_item(Course, course.dict(), "Course"), course.CID)
+
+@app.post("/courses/bulk")
+async def bulk_create_courses(request: Request, mode: str = "insert"):
+    records = parse_records(await request.body(), request.headers.get("content-type"))
+    result = await run_in_threadpool(bulk_import, engine, Course, COURSE_RULES, "CID", records, mode)
+    read_cache.invalidate(Course.__tablename__, record_ids(records, "CID") if mode == "upsert" else ())
+    return result
 
 # READ ALL
+COURSE_SORTABLE = ("CID", "CName", "Department", "Credit")
+
 @app.get("/courses/")
-def get_courses(session: Session = Depends(get_session)):
-    return session.exec(select(Course)).all()
+def get_courses(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(course_filters),
+    order_by: Optional[str] = None,
+    desc: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Course.__tablename__)
+    if not_modified:
+        return not_modified
+    page = read_page(session, version, Course, "CID", COURSE_SORTABLE, filters, order_by, desc, cursor, limit,
+                     parse_fields(Course, fields))
+    return json_response(page, response)
+
+@app.get("/courses/options")
+def course_options(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(course_filters),
+    q: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Course.__tablename__)
+    if not_modified:
+        return not_modified
+    return json_response(read_options(session, version, Course, ("CName",), filters, q, limit), response)
+
+@app.post("/courses/batch-get")
+def batch_get_courses(body: IdList, response: Response, session: Session = Depends(get_session)):
+    return json_response(read_items(session, Course, batch_ids(body)), response)
+
+@app.post("/courses/batch-delete")
+def batch_delete_courses(body: IdList):
+    ids = batch_ids(body)
+    return write_and_invalidate(Course, delete_items(Course, ids), *ids)
+
+@app.get("/courses/count")
+def count_courses(filters: dict = Depends(course_filters), session: Session = Depends(get_session)):
+    return count_rows(session, Course, filters)
+
+@app.get("/courses/export")
+def export_courses(format: str = "ndjson", filters: dict = Depends(course_filters)):
+    return export_response(engine, Course, "CID", "courses", format, filters=filters)
 
 # READ ONE
 @app.get("/courses/{course_id}")
-def get_course(course_id: int, session: Session = Depends(get_session)):
-    course = session.get(Course, course_id)
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return course
+def get_course(
+    course_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    not_modified, version = conditional_response(request, response, session, Course.__tablename__)
+    if not_modified:
+        return not_modified
+    return read_item(session, version, Course, course_id, "Course", parse_fields(Course, fields))
 
 # UPDATE
 @app.put("/courses/{course_id}")
-def update_course(course_id: int, new_data: CourseBase, session: Session = Depends(get_session)):
-    course = session.get(Course, course_id)
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    for field, value in new_data.dict(exclude_unset=True).items():
-        setattr(course, field, value)
-    session.commit()
-    session.refresh(course)
-    return course
+def update_course(course_id: int, new_data: CourseBase):
+    return write_and_invalidate(Course, save_item(Course, course_id, new_data.dict(), "Course"),
+                                course_id, new_data.CID)
+
+@app.patch("/courses/{course_id}")
+def patch_course(course_id: int, patch: CoursePatch):
+    data = patch_data(patch)
+    write = update_item(Course, course_id, data, "Course", COURSE_RULES, ())
+    return write_and_invalidate(Course, write, course_id, data.get("CID"))
 
 # DELETE
 @app.delete("/courses/{course_id}")
-def delete_course(course_id: int, session: Session = Depends(get_session)):
-    course = session.get(Course, course_id)
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    session.delete(course)
-    session.commit()
-    return {"message": "Course deleted successfully"}
\ No newline at end of file
+def delete_course(course_id: int):
+    write_and_invalidate(Course, delete_item(Course, course_id, "Course"), course_id)
+    return {"message": "Course deleted successfully"}
+
+
+# ----------------- مسیرهای async (اختیاری) -----------------
+
+if DB_ASYNC:
+    from async_api import crud_router
+
+    app.include_router(crud_router("students", Student, StudentBase, "STID", STUDENT_SORTABLE, person_filters, "Student"), prefix="/async")
+    app.include_router(crud_router("professors", Professor, ProfessorBase, "LID", PROFESSOR_SORTABLE, person_filters, "Professor"), prefix="/async")
+    app.include_router(crud_router("courses", Course, CourseBase, "CID", COURSE_SORTABLE, course_filters, "Course"), prefix="/async")
@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from fastapi import Response
+from sqlalchemy import event
+
+# ----------------- اندازه‌گیری و متریک‌ها (قالب Prometheus) -----------------
+# زمان هر درخواست به تفکیک مسیر و کد وضعیت و زمان هر دستور SQL در histogramهای درون پردازه جمع می‌شود.
+# دستورهای کندتر از SLOW_QUERY_MS با پارامترها و EXPLAIN QUERY PLAN در لاگ نوشته می‌شوند.
+# هر worker متریک‌های خودش را دارد؛ برای دیدن همه workerها هر کدام را جدا scrape کنید یا از نمونه‌ها میانگین بگیرید.
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+slow_query_log = logging.getLogger("slow_query")
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # per-bucket counts (last slot is +Inf), sum
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self.series.items()]
+        for labels, counts, total in sorted(snapshot):
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def gauge(name, help_text, value, kind="gauge"):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+http_duration = Histogram("http_request_duration_seconds", "HTTP request latency",
+                          ("method", "route", "status"), HTTP_BUCKETS)
+sql_duration = Histogram("db_query_duration_seconds", "SQL statement execution time", ("operation",), SQL_BUCKETS)
+slow_queries = 0
+
+
+# ----------------- زمان درخواست‌ها -----------------
+
+class TimingMiddleware:
+    # plain ASGI middleware: BaseHTTPMiddleware would add a task and a queue per request
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # the route template, not the raw path, so that ids do not become label values
+            path = getattr(route, "path", "unmatched")
+            http_duration.observe((scope["method"], path, str(status)), time.perf_counter() - start)
+
+
+# ----------------- زمان دستورهای SQL -----------------
+
+def install_query_timing(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        sql_duration.observe((operation,), elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            log_slow_query(cursor, statement, parameters, executemany, elapsed)
+
+
+def log_slow_query(cursor, statement, parameters, executemany, elapsed):
+    global slow_queries
+    slow_queries += 1
+    plan = ""
+    explainable = statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH"))
+    if SLOW_QUERY_EXPLAIN and explainable and not executemany:
+        try:
+            rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plan = "\n  " + "\n  ".join(str(row[-1]) for row in rows)
+        except Exception as e:  # the plan is best effort; never fail the request because of it
+            plan = f"\n  (EXPLAIN failed: {e})"
+    shown = f"{len(parameters)} parameter sets" if executemany else parameters
+    slow_query_log.warning("slow query %.1f ms: %s params=%s%s", elapsed * 1000, statement, shown, plan)
+
+
+# ----------------- خروجی /metrics -----------------
+
+def pool_lines(engine):
+    pool = engine.pool
+    lines = []
+    for name, method, help_text in (
+        ("db_pool_size", "size", "Configured pool size"),
+        ("db_pool_checked_out", "checkedout", "Connections currently in use"),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Connections opened beyond pool_size"),
+    ):
+        if hasattr(pool, method):
+            # QueuePool.overflow() is negative while the pool is not full yet
+            lines += gauge(name, help_text, max(getattr(pool, method)(), 0))
+    return lines
+
+
+def file_size_lines(engine):
+    path = engine.url.database
+    lines = []
+    for suffix, name in (("", "db_file_size_bytes"), ("-wal", "db_wal_size_bytes")):
+        try:
+            size = os.path.getsize(f"{path}{suffix}")
+        except (OSError, TypeError):
+            continue
+        lines += gauge(name, f"Size of the database{suffix or ''} file", size)
+    return lines
+
+
+def cache_lines(stats):
+    lines = []
+    for key in ("hits", "misses", "evictions", "invalidations"):
+        lines += gauge(f"read_cache_{key}_total", f"Read cache {key}", stats[key], kind="counter")
+    lines += gauge("read_cache_entries", "Entries in the read cache", stats["size"])
+    return lines
+
+
+def metrics_response(engine, cache_stats):
+    lines = [
+        *http_duration.render(),
+        *sql_duration.render(),
+        *gauge("db_slow_queries_total", f"Statements slower than {SLOW_QUERY_MS} ms", slow_queries, kind="counter"),
+        *pool_lines(engine),
+        *file_size_lines(engine),
+        *cache_lines(cache_stats),
+    ]
+    return Response("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -0,0 +1,82 @@
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlmodel import select
+
+# ----------------- صفحه‌بندی Keyset -----------------
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def encode_cursor(order_by, desc, keys):
+    raw = json.dumps({"o": order_by, "d": desc, "k": keys}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, order_by, desc):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(data, dict) or not isinstance(data.get("k"), list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # keys are bound as query parameters, so anything but a column value (a list, an object, null) is rejected here
+    if not all(isinstance(key, (str, int)) and not isinstance(key, bool) for key in data["k"]):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # a cursor is only meaningful for the ordering that produced it
+    if data.get("o") != order_by or data.get("d") != desc:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested ordering")
+    return data["k"]
+
+
+def page_query(model, pk, sortable, filters=None, order_by=None, desc=False, cursor=None, limit=DEFAULT_LIMIT,
+               fields=None):
+    order_by = order_by or pk
+    if order_by not in sortable:
+        raise HTTPException(status_code=400, detail=f"order_by must be one of: {', '.join(sortable)}")
+
+    pk_col = getattr(model, pk)
+    sort_col = getattr(model, order_by)
+    # the primary key breaks ties so that the ordering is total and every row is visited exactly once
+    key_cols = [pk_col] if order_by == pk else [sort_col, pk_col]
+
+    if fields:
+        # only the requested columns plus the keys the next cursor is built from
+        names = dict.fromkeys([*fields, *(c.key for c in key_cols)])
+        stmt = select(*(getattr(model, name) for name in names))
+    else:
+        stmt = select(model)
+    for column, value in (filters or {}).items():
+        if value is not None:
+            stmt = stmt.where(getattr(model, column) == value)
+
+    if cursor:
+        keys = decode_cursor(cursor, order_by, desc)
+        if len(keys) != len(key_cols):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        left = tuple_(*key_cols) if len(key_cols) > 1 else key_cols[0]
+        right = tuple_(*keys) if len(keys) > 1 else keys[0]
+        stmt = stmt.where(left < right if desc else left > right)
+
+    stmt = stmt.order_by(*[c.desc() if desc else c.asc() for c in key_cols])
+    # one extra row tells us whether another page exists without a COUNT(*)
+    return stmt.limit(limit + 1), key_cols, order_by
+
+
+def page_result(rows, key_cols, order_by, desc, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(order_by, desc, [getattr(last, c.key) for c in key_cols])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate(session, model, pk, sortable, filters=None, order_by=None, desc=False, cursor=None, limit=DEFAULT_LIMIT,
+             fields=None):
+    stmt, key_cols, order_by = page_query(model, pk, sortable, filters, order_by, desc, cursor, limit, fields)
+    return page_result(session.exec(stmt).all(), key_cols, order_by, desc, limit)
@@ -0,0 +1,44 @@
+import json
+import os
+
+from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional: gzip only
+    BrotliMiddleware = None
+
+# ----------------- سریال‌سازی JSON و فشرده‌سازی پاسخ‌ها -----------------
+# پاسخ‌ها بدون escape کردن حروف فارسی و با orjson (در صورت نصب) سریال می‌شوند. پاسخ‌های بزرگ‌تر از
+# COMPRESS_MIN_SIZE بایت بر اساس Accept-Encoding با brotli (در صورت نصب brotli-asgi) یا gzip فشرده می‌شوند.
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "5"))
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content):
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(content, response):
+    # returning the response directly skips FastAPI's jsonable_encoder pass over every row;
+    # headers set on the injected response (ETag, Last-Modified) are carried over
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    return FastJSONResponse(content, headers=headers)
+
+
+def install_compression(app):
+    if BrotliMiddleware is not None:
+        app.add_middleware(BrotliMiddleware, quality=COMPRESS_LEVEL, minimum_size=COMPRESS_MIN_SIZE,
+                           gzip_fallback=True)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE, compresslevel=COMPRESS_LEVEL)
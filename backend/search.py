@@ -0,0 +1,136 @@
+import re
+import sys
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+# ----------------- جستجوی متنی نام‌ها با FTS5 -----------------
+# برای هر جدول یک جدول FTS5 بدون محتوا (content='') با همان rowid جدول اصلی ساخته می‌شود و triggerها
+# آن را همگام نگه می‌دارند. متن پیش از نمایه‌شدن و پیش از جستجو یکسان‌سازی می‌شود (ي/ك عربی، نیم‌فاصله و ...).
+# نکته: VACUUM ممکن است rowid جدول‌هایی را که INTEGER PRIMARY KEY ندارند تغییر دهد؛ پس از VACUUM دستور
+# python search.py rebuild را اجرا کنید.
+
+NORMALIZE_MAP = {
+    "ي": "ی",
+    "ى": "ی",
+    "ك": "ک",
+    "ة": "ه",
+    "ۀ": "ه",
+    "أ": "ا",
+    "إ": "ا",
+    "\u200c": " ",  # ZWNJ (نیم‌فاصله)
+    "\u200d": "",  # ZWJ
+    "\u0640": "",  # tatweel
+}
+_TRANSLATION = str.maketrans(NORMALIZE_MAP)
+# whitespace and control characters (category Cc, e.g. NUL) are separators: unicode61 splits the indexed text on
+# them too, and a control character inside a quoted FTS5 term is a syntax error
+_SEPARATORS = re.compile(r"[\s\x00-\x1f\x7f-\x9f]+")
+
+# entity -> (table, key column, columns indexed for search, columns shown as the result name)
+SEARCHABLE = {
+    "student": ("student", "STID", ("Fname", "Lname", "Father"), ("Fname", "Lname")),
+    "professor": ("professor", "LID", ("Fname", "Lname"), ("Fname", "Lname")),
+    "course": ("course", "CID", ("CName",), ("CName",)),
+}
+
+
+def normalize(value):
+    return _SEPARATORS.sub(" ", value.translate(_TRANSLATION)).strip()
+
+
+def sql_normalize(expr):
+    # the same mapping as normalize(), in plain SQL so the triggers work for any client that writes to the database
+    for source, target in NORMALIZE_MAP.items():
+        expr = f"replace({expr}, char({ord(source)}), '{target}')"
+    return expr
+
+
+def _body(prefix, columns):
+    return sql_normalize(" || ' ' || ".join(f'{prefix}."{column}"' for column in columns))
+
+
+def _ddl(entity):
+    table, _, columns, _ = SEARCHABLE[entity]
+    fts = f"{table}_fts"
+    new_body, old_body = _body("NEW", columns), _body("OLD", columns)
+    watched = ", ".join(f'"{column}"' for column in columns)
+    return fts, [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"body, content='', prefix='2 3', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts} (rowid, body) VALUES (NEW.rowid, {new_body}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, body) VALUES ('delete', OLD.rowid, {old_body}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {watched} ON {table} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, body) VALUES ('delete', OLD.rowid, {old_body}); "
+        f"INSERT INTO {fts} (rowid, body) VALUES (NEW.rowid, {new_body}); END",
+    ]
+
+
+def rebuild(conn, entity):
+    table, _, columns, _ = SEARCHABLE[entity]
+    fts = f"{table}_fts"
+    conn.exec_driver_sql(f"INSERT INTO {fts} ({fts}) VALUES ('delete-all')")
+    conn.exec_driver_sql(f"INSERT INTO {fts} (rowid, body) SELECT rowid, {_body(table, columns)} FROM {table}")
+
+
+def install_search(engine):
+    with engine.begin() as conn:
+        for entity in SEARCHABLE:
+            fts, statements = _ddl(entity)
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).first()
+            for statement in statements:
+                conn.exec_driver_sql(statement)
+            if not exists:
+                # first start on a database that already has rows
+                rebuild(conn, entity)
+
+
+def match_expression(query):
+    # every word must match as a prefix; quoting keeps FTS5 operators in user input from being interpreted
+    terms = ['"' + term.replace('"', '""') + '"*' for term in normalize(query).split(" ") if term]
+    return " ".join(terms)
+
+
+def match_clause(table, expression):
+    # restricts a query on `table` to rows whose indexed names match, so it can be combined with other filters;
+    # expression comes from match_expression() and must not be empty (FTS5 rejects an empty MATCH)
+    return text(
+        f"{table}.rowid IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH :expression)"
+    ).bindparams(expression=expression)
+
+
+def search(session, query, entity=None, limit=20):
+    expression = match_expression(query)
+    if not expression:
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    entities = [entity] if entity else list(SEARCHABLE)
+    results = []
+    for name in entities:
+        if name not in SEARCHABLE:
+            raise HTTPException(status_code=400, detail=f"type must be one of: {', '.join(SEARCHABLE)}")
+        table, key, _, shown = SEARCHABLE[name]
+        title = " || ' ' || ".join(f't."{column}"' for column in shown)
+        rows = session.execute(text(
+            f'SELECT t."{key}" AS id, {title} AS name, f.rank AS rank '
+            f"FROM {table}_fts f JOIN {table} t ON t.rowid = f.rowid "
+            f"WHERE {table}_fts MATCH :expression ORDER BY f.rank LIMIT :limit"
+        ), {"expression": expression, "limit": limit})
+        results.extend({"type": name, "id": row.id, "name": row.name, "rank": row.rank} for row in rows)
+    # bm25 ranks are negative; smaller is a better match
+    results.sort(key=lambda item: item["rank"])
+    return {"items": results[:limit]}
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python search.py rebuild")
+    from main import create_db, engine
+
+    create_db()
+    with engine.begin() as conn:
+        for entity in SEARCHABLE:
+            rebuild(conn, entity)
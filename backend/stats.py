@@ -0,0 +1,131 @@
+import sys
+
+from sqlalchemy import text
+
+# ----------------- آمار از پیش محاسبه‌شده -----------------
+# شمارنده‌ها در جدول stats_counter نگه داشته می‌شوند و triggerها در همان تراکنش نوشتن آن‌ها را به‌روز می‌کنند؛
+# بنابراین خواندن آمار فقط به تعداد گروه‌ها (نه تعداد سطرها) هزینه دارد و هر نویسنده‌ای (bulk، async، ...) را پوشش می‌دهد.
+# برای داده‌ای که پیش از نصب triggerها یا با دستکاری مستقیم فایل وارد شده: python stats.py rebuild
+
+
+# plain DDL rather than a SQLModel class so that `python stats.py rebuild` can import main without redefining the table
+TABLE_DDL = (
+    "CREATE TABLE IF NOT EXISTS stats_counter ("
+    "metric VARCHAR NOT NULL, key VARCHAR NOT NULL, value INTEGER NOT NULL DEFAULT 0, "
+    "PRIMARY KEY (metric, key))"
+)
+
+# table -> (section name in /stats, [(metric, key expression, amount expression)])
+METRICS = {
+    "student": ("students", [
+        ("total", "''", "1"),
+        ("department", '"Department"', "1"),
+        ("major", '"Major"', "1"),
+        ("borncity", '"Borncity"', "1"),
+        ("married", '"Married"', "1"),
+    ]),
+    "professor": ("professors", [
+        ("total", "''", "1"),
+        ("department", '"Department"', "1"),
+        ("major", '"Major"', "1"),
+    ]),
+    "course": ("courses", [
+        ("total", "''", "1"),
+        ("department", '"Department"', "1"),
+        ("credits", '"Department"', 'CAST("Credit" AS INTEGER)'),
+    ]),
+}
+
+UPSERT = (
+    "INSERT INTO stats_counter (metric, key, value) VALUES ('{metric}', {key}, {amount}) "
+    "ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;"
+)
+DECREMENT = (
+    "UPDATE stats_counter SET value = value - {amount} WHERE metric = '{metric}' AND key = {key}; "
+    "DELETE FROM stats_counter WHERE metric = '{metric}' AND key = {key} AND value = 0;"
+)
+
+
+def _row(row, expression):
+    # '"Department"' -> 'NEW."Department"'; constant expressions are left as they are
+    return expression.replace('"', f'{row}."', 1)
+
+
+def _statements(template, table, row):
+    return " ".join(
+        template.format(metric=f"{table}.{metric}", key=_row(row, key), amount=_row(row, amount))
+        for metric, key, amount in METRICS[table][1]
+    )
+
+
+def _watched(table):
+    columns = []
+    for _, key, amount in METRICS[table][1]:
+        for expression in (key, amount):
+            if '"' in expression:
+                column = expression.split('"')[1]
+                if column not in columns:
+                    columns.append(column)
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def _triggers(table):
+    return {
+        f"{table}_stats_ai": f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ai AFTER INSERT ON {table} BEGIN "
+                             f"{_statements(UPSERT, table, 'NEW')} END",
+        f"{table}_stats_ad": f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ad AFTER DELETE ON {table} BEGIN "
+                             f"{_statements(DECREMENT, table, 'OLD')} END",
+        f"{table}_stats_au": f"CREATE TRIGGER IF NOT EXISTS {table}_stats_au AFTER UPDATE OF {_watched(table)} "
+                             f"ON {table} BEGIN {_statements(DECREMENT, table, 'OLD')} "
+                             f"{_statements(UPSERT, table, 'NEW')} END",
+    }
+
+
+def rebuild(conn, table):
+    conn.exec_driver_sql("DELETE FROM stats_counter WHERE metric LIKE ?", (f"{table}.%",))
+    for metric, key, amount in METRICS[table][1]:
+        conn.exec_driver_sql(
+            f"INSERT INTO stats_counter (metric, key, value) "
+            f"SELECT '{table}.{metric}', {key}, SUM({amount}) FROM {table} GROUP BY 2 HAVING SUM({amount}) != 0"
+        )
+
+
+def install_stats(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(TABLE_DDL)
+        for table in METRICS:
+            triggers = _triggers(table)
+            installed = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f"{table}_stats_ai",)
+            ).first()
+            for statement in triggers.values():
+                conn.exec_driver_sql(statement)
+            if not installed:
+                # first start on a database that already has rows
+                rebuild(conn, table)
+
+
+def read_stats(session):
+    result = {
+        section: {metric: 0 if metric == "total" else {} for metric, _, _ in metrics}
+        for section, metrics in METRICS.values()
+    }
+    for row in session.execute(text("SELECT metric, key, value FROM stats_counter")):
+        table, metric = row.metric.split(".", 1)
+        section = result[METRICS[table][0]]
+        if metric == "total":
+            section[metric] = row.value
+        else:
+            section[metric][row.key] = row.value
+    return result
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python stats.py rebuild")
+    from main import create_db, engine
+
+    create_db()
+    with engine.begin() as conn:
+        for table in METRICS:
+            rebuild(conn, table)
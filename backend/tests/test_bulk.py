@@ -0,0 +1,26 @@
+"""Bulk import: invalid rows are reported per row and never fail the whole request."""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+def course(cid, name="ریاضی عمومی"):
+    return {"CID": cid, "CName": name, "Department": "علوم پایه", "Credit": "3"}
+
+
+def test_non_ascii_digits_in_course_id_are_a_row_error(client):
+    records = [course("20001"), course("¹²³⁴⁵"), course("۲۰۰۰۲"), course("20003")]
+    response = client.post("/courses/bulk", json=records)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 2
+    assert [failure["row"] for failure in result["errors"]] == [1, 2]
+    for failure in result["errors"]:
+        assert [error["field"] for error in failure["errors"]] == ["CID"]
@@ -0,0 +1,38 @@
+"""Cursor decoding: anything that is not a cursor produced by encode_cursor is a 400, never a 500."""
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_round_trip():
+    cursor = encode_cursor("Lname", True, ["احمدی", "403112345"])
+    assert decode_cursor(cursor, "Lname", True) == ["احمدی", "403112345"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor([1, 2]),
+    raw_cursor({"o": "STID", "d": False, "k": "403112345"}),
+    raw_cursor({"o": "STID", "d": False, "k": [[1]]}),
+    raw_cursor({"o": "STID", "d": False, "k": [{"a": 1}]}),
+    raw_cursor({"o": "STID", "d": False, "k": [None]}),
+    raw_cursor({"o": "STID", "d": False, "k": [True]}),
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as info:
+        decode_cursor(cursor, "STID", False)
+    assert info.value.status_code == 400
+
+
+def test_cursor_from_another_ordering():
+    with pytest.raises(HTTPException) as info:
+        decode_cursor(encode_cursor("Lname", False, ["احمدی", "403112345"]), "STID", False)
+    assert info.value.detail == "Cursor does not match the requested ordering"
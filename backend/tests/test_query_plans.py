@@ -0,0 +1,76 @@
+"""EXPLAIN QUERY PLAN checks: the filtered list, count and options queries must stay on an index."""
+import re
+
+import pytest
+
+import main
+from pagination import page_query
+
+person_filters = main.person_filters
+course_filters = main.course_filters
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    main.create_db()
+
+
+def query_plan(stmt):
+    compiled = stmt.compile(dialect=main.engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with main.engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)]
+
+
+def assert_uses_index(plan, table, index):
+    # "SCAN student" is a full table scan; "SCAN student_fts VIRTUAL TABLE" is the FTS5 index itself
+    assert not [step for step in plan if re.match(rf"SCAN {table}\b(?!_)", step)], plan
+    assert any(re.match(rf"SEARCH {table} USING (COVERING )?INDEX {index}\b", step) for step in plan), plan
+
+
+LIST_CASES = [
+    (main.Student, "STID", main.STUDENT_SORTABLE, person_filters("فنی و مهندسی"), None,
+     "ix_student_department_major"),
+    (main.Student, "STID", main.STUDENT_SORTABLE, person_filters(major="مهندسی برق"), None,
+     "ix_student_department_major"),
+    (main.Student, "STID", main.STUDENT_SORTABLE, person_filters(borncity="تهران"), None, "ix_student_borncity"),
+    (main.Student, "STID", main.STUDENT_SORTABLE, person_filters("علوم پایه"), "Lname",
+     "ix_student_department_major"),
+    (main.Professor, "LID", main.PROFESSOR_SORTABLE, person_filters("اقتصاد", "مدیریت"), None,
+     "ix_professor_department_major"),
+    (main.Professor, "LID", main.PROFESSOR_SORTABLE, person_filters(borncity="شیراز"), None,
+     "ix_professor_borncity"),
+    (main.Course, "CID", main.COURSE_SORTABLE, course_filters("اقتصاد"), None, "ix_course_department"),
+]
+
+
+@pytest.mark.parametrize("model, pk, sortable, filters, order_by, index", LIST_CASES)
+def test_filtered_list_uses_index(model, pk, sortable, filters, order_by, index):
+    stmt = page_query(model, pk, sortable, filters, order_by)[0]
+    assert_uses_index(query_plan(stmt), model.__tablename__, index)
+
+
+@pytest.mark.parametrize("model, pk, sortable, filters, order_by, index", LIST_CASES)
+def test_count_uses_index(model, pk, sortable, filters, order_by, index):
+    assert_uses_index(query_plan(main.count_query(model, filters)), model.__tablename__, index)
+
+
+@pytest.mark.parametrize("model, label_fields, filters, index", [
+    (main.Student, ("Fname", "Lname"), person_filters("فنی و مهندسی", "مهندسی برق"), "ix_student_department_major"),
+    (main.Professor, ("Fname", "Lname"), person_filters(borncity="تهران"), "ix_professor_borncity"),
+    (main.Course, ("CName",), course_filters("کشاورزی"), "ix_course_department"),
+])
+def test_filtered_options_use_index(model, label_fields, filters, index):
+    stmt = main.options_query(model, label_fields, filters, "", 20)
+    assert_uses_index(query_plan(stmt), model.__tablename__, index)
+
+
+def test_options_id_prefix_is_a_range_search():
+    stmt = main.options_query(main.Student, ("Fname", "Lname"), person_filters(), "4031", 20)
+    assert_uses_index(query_plan(stmt), "student", "ix_student_STID")
+
+
+def test_options_name_query_goes_through_fts():
+    plan = query_plan(main.options_query(main.Student, ("Fname", "Lname"), person_filters(), "علی", 20))
+    assert not [step for step in plan if re.match(r"SCAN student\b(?!_)", step)], plan
+    assert any("student_fts VIRTUAL TABLE" in step for step in plan), plan
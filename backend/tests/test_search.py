@@ -0,0 +1,31 @@
+"""Name search: input that normalizes to nothing is a 400, never an FTS5 syntax error."""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from search import match_expression
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_control_characters_separate_terms():
+    assert match_expression("علی\x00رضا") == '"علی"* "رضا"*'
+
+
+@pytest.mark.parametrize("q", ["\x00", "\x1b", "‌", "ـ", " \x7f "])
+def test_empty_after_normalization(client, q):
+    response = client.get("/search", params={"q": q})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Query must not be empty"
+
+
+@pytest.mark.parametrize("path", ["/students/options", "/professors/options", "/courses/options"])
+@pytest.mark.parametrize("q", ["\x00", "‌", "ـ"])
+def test_options_ignore_a_query_that_normalizes_to_nothing(client, path, q):
+    response = client.get(path, params={"q": q})
+    assert response.status_code == 200
+    assert response.json() == client.get(path).json()
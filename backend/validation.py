@@ -0,0 +1,245 @@
+import re
+from functools import partial
+
+# ----------------- قواعد اعتبارسنجی مشترک (بک‌اند و فرانت‌اند) -----------------
+# این ماژول عمداً به Pydantic یا Streamlit وابسته نیست تا هر دو سمت بتوانند از آن استفاده کنند.
+
+DEPARTMENTS = ("علوم پایه", "کشاورزی", "اقتصاد", "فنی و مهندسی")
+CITIES = ("تهران", "اصفهان", "مشهد", "شیراز", "تبریز", "کرمان", "اهواز", "کرج", "رشت", "یزد", "ارومیه",
+          "قم", "ساری", "بندرعباس", "زاهدان", "سنندج", "قزوین", "بوشهر", "خرم آباد", "اردبیل", "همدان",
+          "گرگان", "ایلام", "یاسوج", "بجنورد", "زنجان")
+MAJORS = {
+    "فنی و مهندسی": ("مهندسی برق", "مهندسی کامپیوتر", "مهندسی عمران", "مهندسی پلیمر", "مهندسی مکانیک", "مهندسی معدن"),
+    "کشاورزی": ("باغبانی", "مهندسی کشاورزی", "علوم دام"),
+    "اقتصاد": ("حسابداری", "مدیریت", "مدیریت مالی", "مدیریت بازرگانی"),
+    "علوم پایه": ("شیمی", "زمین شناسی", "علوم کامپیوتر", "ریاضی", "فیزیک"),
+}
+MARITAL_STATUSES = ("مجرد", "متاهل")
+CREDITS = ("1", "2", "3", "4")
+
+DEPARTMENT_SET = frozenset(DEPARTMENTS)
+CITY_SET = frozenset(CITIES)
+MAJOR_SETS = {department: frozenset(majors) for department, majors in MAJORS.items()}
+MAJOR_DEPARTMENT = {major: department for department, majors in MAJORS.items() for major in majors}
+MARITAL_STATUS_SET = frozenset(MARITAL_STATUSES)
+CREDIT_SET = frozenset(CREDITS)
+
+STID_PATTERN = re.compile(r"\d{3}114150\d{2}")
+LID_PATTERN = re.compile(r"\d{6}")
+# ASCII only: str.isdigit() also accepts digits such as "²" that int() cannot parse
+CID_PATTERN = re.compile(r"[0-9]+")
+PERSIAN_TEXT_PATTERN = re.compile(r"[آ-ی\s]+")
+BIRTH_PATTERN = re.compile(r"\d{4}/\d{2}/\d{2}")
+IDS_PATTERN = re.compile(r"\d{6}[آ-ی]\d{2}")
+POSTALCODE_PATTERN = re.compile(r"\d{10}")
+CPHONE_PATTERN = re.compile(r"98\d{10}")
+HPHONE_PATTERN = re.compile(r"0\d{2,3}\d{8}")
+NATIONAL_ID_PATTERN = re.compile(r"\d{10}")
+
+REQUIRED_MESSAGE = "این فیلد الزامی است."
+NOT_TEXT_MESSAGE = "مقدار این فیلد باید متن باشد."
+
+
+# هر تابع check_* در صورت معتبر بودن مقدار None و در غیر این صورت پیام خطا را برمی‌گرداند.
+def check_stid(v):
+    if not STID_PATTERN.fullmatch(v):
+        return "شماره دانشجویی باید یک عدد ۱۱ رقمی معتبر مانند 40311415001 باشد."
+    return None
+
+
+def check_lid(v):
+    if not LID_PATTERN.fullmatch(v):
+        return "کد استاد باید یک عدد ۶ رقمی باشد."
+    return None
+
+
+def check_cid(v):
+    if not CID_PATTERN.fullmatch(v):
+        return "کد درس باید فقط شامل ارقام باشد."
+    if not (10000 <= int(v) <= 99999):
+        return "کد درس باید یک عدد ۵ رقمی باشد."
+    return None
+
+
+def check_persian_name(v, label="نام"):
+    if len(v) > 10:
+        return f"{label} نباید بیشتر از ۱۰ کاراکتر باشد."
+    if not PERSIAN_TEXT_PATTERN.fullmatch(v):
+        return f"{label} باید فقط شامل حروف فارسی باشد."
+    return None
+
+
+def check_course_name(v):
+    if len(v) > 25:
+        return "نام درس نباید بیشتر از ۲۵ کاراکتر باشد."
+    if not PERSIAN_TEXT_PATTERN.fullmatch(v):
+        return "نام درس باید فقط شامل حروف فارسی باشد."
+    return None
+
+
+def check_birth(v):
+    if not BIRTH_PATTERN.fullmatch(v):
+        return "تاریخ تولد باید در قالب YYYY/MM/DD وارد شود."
+    year, month, day = map(int, v.split("/"))
+    if not (1300 <= year <= 1404):
+        return "سال باید بین 1300 تا 1404 باشد."
+    if not (1 <= month <= 12):
+        return "ماه باید بین 1 تا 12 باشد."
+    if month <= 6 and not (1 <= day <= 31):
+        return "روز باید بین 1 تا 31 باشد."
+    if month > 6 and not (1 <= day <= 30):
+        return "روز باید بین 1 تا 30 باشد."
+    return None
+
+
+def check_ids(v):
+    if not IDS_PATTERN.fullmatch(v):
+        return "شماره شناسنامه باید شامل عدد ۶ رقمی، یک حرف فارسی، و عدد ۲ رقمی باشد."
+    return None
+
+
+def check_borncity(v):
+    if v not in CITY_SET:
+        return "محل تولد باید یکی از مراکز استان کشور باشد."
+    return None
+
+
+def check_address(v):
+    if len(v) > 100:
+        return "آدرس نباید بیشتر از ۱۰۰ کاراکتر باشد."
+    return None
+
+
+def check_postalcode(v):
+    if not POSTALCODE_PATTERN.fullmatch(v):
+        return "کد پستی باید یک عدد ۱۰ رقمی باشد."
+    return None
+
+
+def check_cphone(v):
+    if not CPHONE_PATTERN.fullmatch(v):
+        return ".شماره موبایل باید با 98 شروع شود و بجز 98 شامل 10 رقم عددی باشد"
+    return None
+
+
+def check_hphone(v):
+    if not HPHONE_PATTERN.fullmatch(v):
+        return "شماره تلفن ثابت باید با 0 شروع شود و شامل کد شهر (۲ یا ۳ رقمی) و شماره ۸ رقمی باشد."
+    return None
+
+
+def check_department(v):
+    if v not in DEPARTMENT_SET:
+        return "دانشکده باید یکی از موارد کشاورزی، اقتصاد، فنی و مهندسی ، علوم پایه باشد."
+    return None
+
+
+def check_major(v, department):
+    majors = MAJOR_SETS.get(department)
+    if majors is None:
+        return "لطفاً ابتدا دانشکده معتبری وارد کنید."
+    if v not in majors:
+        return f"رشته وارد شده با دانشکده انتخاب‌شده مطابقت ندارد. رشته‌های مجاز: {', '.join(MAJORS[department])}"
+    return None
+
+
+def check_married(v):
+    if v not in MARITAL_STATUS_SET:
+        return "وضعیت تأهل فقط می‌تواند مجرد یا متاهل باشد."
+    return None
+
+
+def check_national_id(v):
+    if not NATIONAL_ID_PATTERN.fullmatch(v):
+        return "کد ملی باید ۱۰ رقمی باشد."
+    if len(set(v)) == 1:
+        return "کد ملی نامعتبر است."
+    check = sum(int(v[i]) * (10 - i) for i in range(9)) % 11
+    last_digit = int(v[9])
+    if (check < 2 and last_digit != check) or (check >= 2 and last_digit != (11 - check)):
+        return "کد ملی نامعتبر است."
+    return None
+
+
+def check_credit(v):
+    if v not in CREDIT_SET:
+        return "تعداد واحد باید عددی بین ۱ تا ۴ باشد."
+    return None
+
+
+# ----------------- جدول قواعد هر موجودیت -----------------
+# هر قاعده (value, record) را می‌گیرد تا قواعد وابسته به فیلدهای دیگر (مثل رشته) هم در همین جدول جا شوند.
+
+def _field(check):
+    return lambda v, record: check(v)
+
+
+def _major(v, record):
+    return check_major(v, record.get("Department"))
+
+
+STUDENT_RULES = {
+    "STID": _field(check_stid),
+    "Fname": _field(partial(check_persian_name, label="نام")),
+    "Lname": _field(partial(check_persian_name, label="نام خانوادگی")),
+    "ids": _field(check_ids),
+    "Borncity": _field(check_borncity),
+    "Father": _field(partial(check_persian_name, label="نام پدر")),
+    "BIRTH": _field(check_birth),
+    "Address": _field(check_address),
+    "Postalcode": _field(check_postalcode),
+    "Cphone": _field(check_cphone),
+    "Hphone": _field(check_hphone),
+    "Department": _field(check_department),
+    "Major": _major,
+    "Id": _field(check_national_id),
+    "Married": _field(check_married),
+}
+
+PROFESSOR_RULES = {
+    "LID": _field(check_lid),
+    "Fname": _field(partial(check_persian_name, label="نام")),
+    "Lname": _field(partial(check_persian_name, label="نام خانوادگی")),
+    "Department": _field(check_department),
+    "Major": _major,
+    "Borncity": _field(check_borncity),
+    "Birth": _field(check_birth),
+    "Address": _field(check_address),
+    "Postalcode": _field(check_postalcode),
+    "Cphone": _field(check_cphone),
+    "Hphone": _field(check_hphone),
+}
+
+COURSE_RULES = {
+    "CID": _field(check_cid),
+    "CName": _field(check_course_name),
+    "Department": _field(check_department),
+    "Credit": _field(check_credit),
+}
+
+
+def check_field(rules, field, value, record):
+    return rules[field](value, record)
+
+
+def validate_record(rules, record):
+    errors = {}
+    for field, rule in rules.items():
+        value = record.get(field)
+        if value is None:
+            errors[field] = REQUIRED_MESSAGE
+        elif not isinstance(value, str):
+            errors[field] = NOT_TEXT_MESSAGE
+        elif error := rule(value, record):
+            errors[field] = error
+    return errors
+
+
+def validate_batch(rules, records):
+    """Validate many records in one call; returns (index, {field: message}) for each invalid record."""
+    failures = []
+    for index, record in enumerate(records):
+        errors = validate_record(rules, record) if isinstance(record, dict) else {None: "رکورد باید یک شیء باشد."}
+        if errors:
+            failures.append((index, errors))
+    return failures
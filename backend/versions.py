@@ -0,0 +1,75 @@
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field
+
+# ----------------- نسخه جدول‌ها برای ETag و Last-Modified -----------------
+# هر نوشتن در همان تراکنش شمارنده نسخه جدول را یک واحد بالا می‌برد. درخواست‌های GET فقط همین
+# یک سطر را می‌خوانند تا اگر داده تغییری نکرده بود بدون خواندن سطرها 304 برگردانند.
+
+
+class TableVersion(SQLModel, table=True):
+    __tablename__ = "table_version"
+
+    name: str = Field(primary_key=True)
+    version: int = 0
+    updated_at: float = 0
+
+
+BUMP_SQL = text(
+    "INSERT INTO table_version (name, version, updated_at) VALUES (:name, 1, :now) "
+    "ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at"
+)
+READ_SQL = text("SELECT version, updated_at FROM table_version WHERE name = :name")
+
+
+def bump_version(session, table):
+    session.execute(BUMP_SQL, {"name": table, "now": time.time()})
+
+
+def read_version(session, table):
+    row = session.execute(READ_SQL, {"name": table}).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def modified_since(request, updated_at):
+    header = request.headers.get("if-modified-since")
+    if not header or updated_at is None:
+        return True
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return True
+    # Last-Modified has one-second resolution, so the client can only echo whole seconds back;
+    # two writes within the same second are told apart by the ETag
+    return int(updated_at) > since
+
+
+def _opaque(tag):
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def conditional_response(request, response, session, table):
+    """Set ETag/Last-Modified on response; return (304 response or None, table version).
+
+    The version is read in the request's transaction, so callers key the read cache on it."""
+    version, updated_at = read_version(session, table)
+    headers = {"ETag": f'W/"{table}-{version}"', "Cache-Control": "no-cache"}
+    if updated_at is not None:
+        headers["Last-Modified"] = formatdate(updated_at, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison, as RFC 9110 requires for If-None-Match
+        # "*" is not honoured: the version belongs to the table, so it says nothing about whether one row exists
+        tags = {_opaque(tag) for tag in if_none_match.split(",")}
+        fresh = _opaque(headers["ETag"]) in tags
+    else:
+        fresh = not modified_since(request, updated_at) if "if-modified-since" in request.headers else False
+    if fresh:
+        return Response(status_code=304, headers=headers), version
+    response.headers.update(headers)
+    return None, version
@@ -0,0 +1,124 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlmodel import Session
+
+from database import write_engine
+
+# ----------------- صف نوشتن تک‌نویسنده با commit گروهی -----------------
+# SQLite در هر لحظه فقط یک نویسنده دارد؛ به جای این که هر درخواست جداگانه برای قفل نوشتن رقابت کند و
+# جداگانه commit کند، درخواست‌ها در صف قرار می‌گیرند و یک thread همه را در یک تراکنش commit می‌کند.
+
+WRITE_QUEUE_ENABLED = os.getenv("DB_WRITE_QUEUE", "0") == "1"
+WRITE_WINDOW_MS = float(os.getenv("DB_WRITE_WINDOW_MS", "2"))
+WRITE_MAX_BATCH = int(os.getenv("DB_WRITE_MAX_BATCH", "256"))
+
+_STOP = object()
+
+
+class WriteQueue:
+    def __init__(self, engine, window_ms=WRITE_WINDOW_MS, max_batch=WRITE_MAX_BATCH):
+        self.engine = engine
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.thread = None
+        self.batches = 0
+        self.writes = 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, fn):
+        """Run fn(session) inside the next group transaction and return its result (or raise its error)."""
+        future = Future()
+        self.queue.put((fn, future))
+        return future.result()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self.queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is _STOP:
+                return
+            self._commit_group(self._collect(first))
+
+    def _commit_group(self, batch):
+        outcomes = []
+        try:
+            with Session(write_engine(self.engine)) as session:
+                for fn, future in batch:
+                    # a savepoint per write so one failing caller does not roll back the others
+                    savepoint = session.begin_nested()
+                    try:
+                        result = fn(session)
+                        savepoint.commit()
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        savepoint.rollback()
+                        outcomes.append((future, None, e))
+                session.commit()
+        except Exception as e:
+            # the group commit itself failed, so nothing in this batch was persisted
+            for fn, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_queue = None
+
+
+def start_writer(engine):
+    global write_queue
+    if WRITE_QUEUE_ENABLED and write_queue is None:
+        write_queue = WriteQueue(engine)
+        write_queue.start()
+
+
+def stop_writer():
+    global write_queue
+    if write_queue is not None:
+        write_queue.stop()
+        write_queue = None
+
+
+def run_write(engine, fn):
+    if write_queue is not None:
+        return write_queue.submit(fn)
+    with Session(write_engine(engine)) as session:
+        result = fn(session)
+        session.commit()
+        return result
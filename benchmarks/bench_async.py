@@ -0,0 +1,90 @@
+"""Side-by-side throughput of the sync handlers and the DB_ASYNC=1 handlers under /async.
+
+Starts one uvicorn worker on a scratch database, seeds it through the bulk endpoint and
+hammers GET /students/{id} on both paths with the same concurrency.
+
+    python benchmarks/bench_async.py --concurrency 200 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+
+def make_student(i):
+    return {"STID": f"{i // 100:03d}114150{i % 100:02d}", "Fname": "علی", "Lname": "رضایی", "ids": "123456ب12",
+            "Borncity": "تهران", "Father": "حسن", "BIRTH": "1380/01/01", "Address": "تهران، خیابان آزادی",
+            "Postalcode": "1234567890", "Cphone": "989121234567", "Hphone": "02112345678",
+            "Department": "فنی و مهندسی", "Major": "مهندسی برق", "Id": "0012345679", "Married": "مجرد"}
+
+
+def start_server(port, env):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/students/?limit=1", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def load(base_url, path_prefix, ids, concurrency, seconds):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                res = await client.get(f"{path_prefix}/students/{random.choice(ids)}")
+                res.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DB_ASYNC="1", DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    proc = start_server(args.port, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        students = [make_student(i) for i in range(args.rows)]
+        httpx.post(f"{base_url}/students/bulk", json=students, timeout=300).raise_for_status()
+        ids = [s["STID"] for s in students]
+        for name, prefix in (("sync", ""), ("async", "/async")):
+            result = asyncio.run(load(base_url, prefix, ids, args.concurrency, args.seconds))
+            print(f"{name:>5}: {result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the legacy and WAL engine profiles under concurrent readers and writers.
+
+    python benchmarks/bench_db_profile.py --threads 16 --seconds 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from database import make_engine  # noqa: E402
+
+
+def run(profile, threads, seconds, write_ratio):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = make_engine(f"sqlite:///{path}", profile)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, payload TEXT)"))
+        conn.execute(text("INSERT INTO item (payload) VALUES (:p)"), [{"p": "x" * 100}] * 10000)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(n):
+        local = {"reads": 0, "writes": 0, "errors": 0}
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            try:
+                if (i * threads + n) % 100 < write_ratio * 100:
+                    with engine.begin() as conn:
+                        conn.execute(text("INSERT INTO item (payload) VALUES (:p)"), {"p": "y" * 100})
+                    local["writes"] += 1
+                else:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT payload FROM item WHERE id = :id"), {"id": i % 10000 + 1}).all()
+                    local["reads"] += 1
+            except OperationalError:
+                local["errors"] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    engine.dispose()
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+    for profile in ("legacy", "wal"):
+        result = run(profile, args.threads, args.seconds, args.write_ratio)
+        print(f"{profile:>7}: {result['reads']:9.0f} reads/s {result['writes']:8.0f} writes/s "
+              f"{result['errors']:6.1f} errors/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Per-interaction rerun cost of the Streamlit pages.
+
+Replays a user adding and editing a student with streamlit's AppTest against a seeded backend.
+As in the browser, changing a widget inside an st.form costs nothing until the form is submitted;
+every other change reruns the script, and the time and number of API requests of each rerun are
+recorded. AppTest always executes the whole script, so for st.fragment pages the times are an upper
+bound of what the browser waits for.
+
+    python benchmarks/bench_frontend_rerun.py --rows 10000
+    git show HEAD~1:frontend/main.py > /tmp/main_before.py
+    python benchmarks/bench_frontend_rerun.py --app /tmp/main_before.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+import requests
+
+from bench_async import BACKEND_DIR, make_student, start_server
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend")
+sys.path[:0] = [FRONTEND_DIR, BACKEND_DIR]
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+api_requests = 0
+send = requests.Session.send
+
+
+def counting_send(self, request, **kwargs):
+    global api_requests
+    api_requests += 1
+    return send(self, request, **kwargs)
+
+
+requests.Session.send = counting_send
+
+
+def widget(at, label):
+    for element in (*at.main.text_input, *at.main.text_area, *at.main.selectbox, *at.main.button):
+        if element.label == label:
+            return element
+    raise LookupError(label)
+
+
+def in_form(element):
+    return bool(getattr(element.proto, "form_id", ""))
+
+
+def replay(app, steps):
+    global api_requests
+    at = AppTest.from_file(app, default_timeout=60)
+    at.run()
+    timings = []
+    for label, value in steps:
+        element = at.sidebar.selectbox[0] if label is None else widget(at, label)
+        if value is None:
+            element.click()
+        elif callable(value):
+            element.set_value(value(element))
+        else:
+            element.set_value(value)
+        # a submit button always reruns; any other widget in a form only updates the pending form state
+        if value is not None and in_form(element):
+            continue
+        api_requests = 0
+        start = time.perf_counter()
+        at.run()
+        timings.append((label or "menu", time.perf_counter() - start, api_requests))
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return timings
+
+
+def second_option(element):
+    return element.options[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--app", default=os.path.join(FRONTEND_DIR, "main.py"))
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    proc = start_server(args.port, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    os.environ["API_URL"] = base_url
+    try:
+        students = [make_student(i) for i in range(args.rows)]
+        httpx.post(f"{base_url}/students/bulk", json=students, timeout=300).raise_for_status()
+        new = make_student(args.rows)
+        fields = [("شماره دانشجویی", new["STID"]), ("نام", "مریم"), ("نام خانوادگی", "احمدی"), ("نام پدر", "حسن"),
+                  ("شماره شناسنامه", new["ids"]), ("تاریخ تولد (YYYY/MM/DD)", new["BIRTH"]),
+                  ("آدرس", new["Address"]), ("کد پستی", new["Postalcode"]), ("شماره موبایل", new["Cphone"]),
+                  ("شماره تلفن ثابت", new["Hphone"]), ("کد ملی", new["Id"])]
+        scenarios = {
+            "add student": [(None, "افزودن دانشجو"), ("دانشکده", second_option), ("رشته", second_option),
+                            *fields, ("ثبت", None)],
+            "edit student": [(None, "ویرایش دانشجو"), ("جستجو با کد یا نام", students[-1]["STID"]),
+                             ("دانشکده", second_option), ("رشته", second_option), ("نام", "زهرا"),
+                             ("نام خانوادگی", "کریمی"), ("آدرس", "شیراز"), ("شماره موبایل", "989351234567"),
+                             ("ثبت تغییرات", None)],
+        }
+        print(f"{args.app} against {args.rows} students")
+        for name, steps in scenarios.items():
+            timings = replay(args.app, steps)
+            total = sum(seconds for _, seconds, _ in timings)
+            calls = sum(count for _, _, count in timings)
+            print(f"  {name}: {len(steps)} interactions, {len(timings)} reruns, {calls} API requests, "
+                  f"{total * 1000:.0f} ms total")
+            for label, seconds, count in timings:
+                print(f"    {label:<30} {seconds * 1000:7.1f} ms  {count} requests")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
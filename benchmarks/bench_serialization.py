@@ -0,0 +1,80 @@
+"""Serialization time and bytes on the wire for a large student list.
+
+Compares the previous response path (SQLModel objects through jsonable_encoder and the stock
+JSONResponse) with FastJSONResponse on plain dicts, and reports the body size with and without
+\\u escaping, gzip and brotli.
+
+    python benchmarks/bench_serialization.py --rows 100000
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bench_async import BACKEND_DIR, make_student
+
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from main import Student  # noqa: E402
+from responses import COMPRESS_LEVEL, FastJSONResponse, orjson  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = [make_student(i) for i in range(args.rows)]
+    objects = [Student(**row) for row in rows]
+    page = {"items": rows, "next_cursor": None}
+
+    cases = {
+        "jsonable_encoder(SQLModel) + JSONResponse": lambda: JSONResponse(
+            jsonable_encoder({"items": objects, "next_cursor": None})).body,
+        "jsonable_encoder(dict) + JSONResponse": lambda: JSONResponse(jsonable_encoder(page)).body,
+        f"FastJSONResponse ({'orjson' if orjson else 'json'})": lambda: FastJSONResponse(page).body,
+    }
+    print(f"{args.rows} students, best of {args.repeat}")
+    body = None
+    for name, fn in cases.items():
+        seconds, body = timed(fn, args.repeat)
+        print(f"  {name:<45} {seconds * 1000:8.0f} ms")
+
+    escaped = json.dumps(page, separators=(",", ":")).encode("ascii")
+    sizes = {"json with \\u escapes": escaped, "json (utf-8)": body}
+    seconds, sizes[f"gzip level {COMPRESS_LEVEL}"] = timed(lambda: gzip.compress(body, COMPRESS_LEVEL), 1)
+    timings = {f"gzip level {COMPRESS_LEVEL}": seconds}
+    if brotli is not None:
+        seconds, sizes[f"brotli quality {COMPRESS_LEVEL}"] = timed(
+            lambda: brotli.compress(body, quality=COMPRESS_LEVEL), 1)
+        timings[f"brotli quality {COMPRESS_LEVEL}"] = seconds
+    print("bytes on the wire")
+    for name, data in sizes.items():
+        extra = f"  ({timings[name] * 1000:.0f} ms to compress)" if name in timings else ""
+        print(f"  {name:<45} {len(data) / 1024:10.0f} KiB{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Requests/sec on the read endpoints as the number of gunicorn workers grows.
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --clients 4 --seconds 10
+
+The load is generated by several client processes so that the client is not the bottleneck;
+run it on a machine with more cores than the largest worker count for meaningful numbers.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench_async import BACKEND_DIR, make_student
+
+PATHS = ("/students/{id}", "/students/?limit=50")
+
+
+def start_gunicorn(port, workers, env):
+    env = dict(env, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning", "main:app"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/students/?limit=1", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("gunicorn did not start")
+
+
+def client(base_url, ids, concurrency, seconds, results):
+    async def run():
+        done = 0
+        deadline = time.perf_counter() + seconds
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+            async def worker():
+                nonlocal done
+                while time.perf_counter() < deadline:
+                    path = random.choice(PATHS).format(id=random.choice(ids))
+                    (await http.get(path)).raise_for_status()
+                    done += 1
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return done
+
+    results.put(asyncio.run(run()))
+
+
+def measure(base_url, ids, clients, concurrency, seconds):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=client, args=(base_url, ids, concurrency, seconds, results))
+             for _ in range(clients)]
+    for p in procs:
+        p.start()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    env.pop("DB_SCHEMA_READY", None)
+    base_url = f"http://127.0.0.1:{args.port}"
+    students = [make_student(i) for i in range(args.rows)]
+    ids = [s["STID"] for s in students]
+
+    seeded = False
+    for workers in args.workers:
+        proc = start_gunicorn(args.port, workers, env)
+        try:
+            if not seeded:
+                httpx.post(f"{base_url}/students/bulk", json=students, timeout=300).raise_for_status()
+                seeded = True
+            rps = measure(base_url, ids, args.clients, args.concurrency, args.seconds)
+            print(f"{workers:>2} worker(s): {rps:8.0f} req/s")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
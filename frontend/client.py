@@ -0,0 +1,95 @@
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ----------------- لایه ارتباط با API -----------------
+# یک requests.Session مشترک (keep-alive با pool اتصال، timeout و تلاش دوباره) برای همه اجراهای دوباره صفحه.
+# پاسخ‌های GET با st.cache_data نگه داشته می‌شوند؛ کلید کش شامل شماره نسل هر موجودیت است و هر نوشتن موفق
+# فقط نسل همان موجودیت را بالا می‌برد. پس از پایان CACHE_TTL پاسخ با If-None-Match دوباره اعتبارسنجی می‌شود.
+
+BASE_URL = os.getenv("API_URL", "http://nginx/api")
+TIMEOUT = (3.05, float(os.getenv("API_READ_TIMEOUT", "30")))
+CACHE_TTL = int(os.getenv("FRONTEND_CACHE_TTL", "30"))
+ETAG_STORE_SIZE = 512
+
+
+@st.cache_resource
+def http_session():
+    session = requests.Session()
+    # POST is not retried: a retry after a lost response would turn a successful create into a 409
+    retry = Retry(total=3, connect=3, read=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"}))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def _generations():
+    return {}
+
+
+@st.cache_resource
+def _etags():
+    return {}
+
+
+def entity_of(path):
+    return path.strip("/").split("/")[0]
+
+
+def invalidate(entity):
+    generations = _generations()
+    generations[entity] = generations.get(entity, 0) + 1
+
+
+def request(method, path, **kwargs):
+    res = http_session().request(method, f"{BASE_URL}{path}", timeout=TIMEOUT, **kwargs)
+    res.raise_for_status()
+    return res
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=256, show_spinner=False)
+def _cached_get(path, params, generation):
+    store = _etags()
+    key = (path, params)
+    cached = store.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    res = http_session().get(f"{BASE_URL}{path}", params=dict(params), headers=headers, timeout=TIMEOUT)
+    if res.status_code == 304 and cached:
+        return cached[1]
+    res.raise_for_status()
+    data = res.json()
+    if etag := res.headers.get("ETag"):
+        if len(store) >= ETAG_STORE_SIZE:
+            store.pop(next(iter(store)))
+        store[key] = (etag, data)
+    return data
+
+
+def get_json(path, params=None):
+    params = tuple(sorted((params or {}).items()))
+    return _cached_get(path, params, _generations().get(entity_of(path), 0))
+
+
+def send(method, path, **kwargs):
+    # a successful write only invalidates the cached reads of its own entity
+    res = request(method, path, **kwargs)
+    invalidate(entity_of(path))
+    return res
+
+
+def post(path, json):
+    return send("POST", path, json=json)
+
+
+def put(path, json):
+    return send("PUT", path, json=json)
+
+
+def delete(path):
+    return send("DELETE", path)
@@ -1,7 +1,14 @@
+from itertools import chain
+
 import streamlit as st
 import requests
 import pandas as pd
-import re
+
+import client
+from client import get_json
+from upload import FIRST_DATA_ROW, READ_ERRORS, normalize, read_chunks, send_batches, validate_students
+from validation import (CITIES, COURSE_RULES, CREDITS, DEPARTMENTS, MAJORS, MARITAL_STATUSES, PROFESSOR_RULES,
+                        STUDENT_RULES, validate_record)
 
 # تنظیمات صفحه
 st.set_page_config(page_title="سامانه مدیریت دانشگاه", layout="centered")
@@ -20,270 +27,350 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# تنظیمات API
-BASE_URL = "http://nginx/api"
-
-# مقادیر مجاز
-VALID_DEPARTMENTS = ["علوم پایه", "کشاورزی", "اقتصاد", "فنی و مهندسی"]
-VALID_CITIES = ["تهران", "اصفهان", "مشهد", "شیراز", "تبریز", "کرمان", "اهواز", "کرج", "رشت", "یزد", "ارومیه",
-                "قم", "ساری", "بندرعباس", "زاهدان", "سنندج", "قزوین", "بوشهر", "خرم آباد", "اردبیل", "همدان",
-                "گرگان", "ایلام", "یاسوج", "بجنورد", "زنجان"]
-VALID_MAJORS = {
-    "فنی و مهندسی": ["مهندسی برق", "مهندسی کامپیوتر", "مهندسی عمران", "مهندسی پلیمر", "مهندسی مکانیک", "مهندسی معدن"],
-    "کشاورزی": ["باغبانی", "مهندسی کشاورزی", "علوم دام"],
-    "اقتصاد": ["حسابداری", "مدیریت", "مدیریت مالی", "مدیریت بازرگانی"],
-    "علوم پایه": ["شیمی", "زمین شناسی", "علوم کامپیوتر", "ریاضی", "فیزیک"]
+# مقادیر مجاز و قواعد اعتبارسنجی (مشترک با بک‌اند در validation.py)
+VALID_DEPARTMENTS = DEPARTMENTS
+VALID_CITIES = CITIES
+VALID_MAJORS = MAJORS
+
+# برچسب ستون‌ها به ترتیب نمایش در جدول‌ها
+STUDENT_COLUMNS = {
+    "STID": "شماره دانشجویی",
+    "Fname": "نام",
+    "Lname": "نام خانوادگی",
+    "Father": "نام پدر",
+    "ids": "شماره شناسنامه",
+    "BIRTH": "تاریخ تولد",
+    "Id": "کد ملی",
+    "Address": "آدرس",
+    "Postalcode": "کد پستی",
+    "Cphone": "شماره موبایل",
+    "Hphone": "تلفن ثابت",
+    "Borncity": "محل تولد",
+    "Department": "دانشکده",
+    "Major": "رشته",
+    "Married": "وضعیت تأهل",
+}
+PROFESSOR_COLUMNS = {
+    "LID": "کد استاد",
+    "Fname": "نام",
+    "Lname": "نام خانوادگی",
+    "Department": "دانشکده",
+    "Major": "رشته",
+    "Borncity": "محل تولد",
+    "Birth": "تاریخ تولد",
+    "Address": "آدرس",
+    "Postalcode": "کد پستی",
+    "Cphone": "شماره موبایل",
+    "Hphone": "تلفن ثابت",
+}
+COURSE_COLUMNS = {
+    "CID": "کد درس",
+    "CName": "نام درس",
+    "Department": "دانشکده",
+    "Credit": "تعداد واحد",
 }
+# ستون‌هایی که بک‌اند می‌تواند بر اساس آن‌ها مرتب کند (STUDENT_SORTABLE و ... در backend/main.py)
+STUDENT_SORTABLE = ("STID", "Fname", "Lname", "Department", "Major", "Borncity", "BIRTH")
+PROFESSOR_SORTABLE = ("LID", "Fname", "Lname", "Department", "Major", "Borncity", "Birth")
+COURSE_SORTABLE = ("CID", "CName", "Department", "Credit")
+PAGE_SIZES = (25, 50, 100, 500)
+PICKER_LIMIT = 50
+# رفتار ورود گروهی با کلیدهای تکراری (mode در POST /students/bulk)
+UPLOAD_MODES = {"insert": "گزارش به‌عنوان خطا", "skip": "نادیده گرفتن", "upsert": "جایگزینی اطلاعات قبلی"}
+MAX_ERROR_ROWS = 10000
+ERROR_COLUMNS = {"row": "ردیف", "field": "فیلد", "value": "مقدار", "message": "خطا"}
+ALL = "همه"
 
 # توابع اعتبارسنجی
-def validate_persian_name(name, field_name):
-    if len(name) > 10:
-        return f"❌ {field_name} نباید بیشتر از ۱۰ کاراکتر باشد."
-    if not re.fullmatch(r"^[آ-ی\s]+$", name):
-        return f"❌ {field_name} باید فقط شامل حروف فارسی باشد."
-    return None
-
-def validate_birth_date(birth):
-    if not re.fullmatch(r"\d{4}/\d{2}/\d{2}", birth):
-        return "❌ تاریخ تولد باید به صورت YYYY/MM/DD باشد."
-    try:
-        year, month, day = map(int, birth.split("/"))
-        if not (1300 <= year <= 1404):
-            return "❌ سال تولد باید بین 1300 تا 1404 باشد."
-        if not (1 <= month <= 12):
-            return "❌ ماه تولد باید بین 1 تا 12 باشد."
-        if month <= 6 and not (1 <= day <= 31):
-            return "❌ برای ماه‌های ۱ تا ۶، روز باید بین 1 تا 31 باشد."
-        elif month > 6 and not (1 <= day <= 30):
-            return "❌ برای ماه‌های ۷ تا ۱۲، روز باید بین 1 تا 30 باشد."
-    except ValueError:
-        return "❌ تاریخ تولد نامعتبر است."
-    return None
-
-def validate_national_id(id_code):
-    if not re.fullmatch(r"\d{10}", id_code):
-        return "❌ کد ملی باید ۱۰ رقمی و فقط عدد باشد."
-    if len(set(id_code)) == 1:
-        return "❌ کد ملی معتبر نیست."
-    check = sum(int(id_code[i]) * (10 - i) for i in range(9)) % 11
-    last_digit = int(id_code[9])
-    if (check < 2 and last_digit != check) or (check >= 2 and last_digit != (11 - check)):
-        return "❌ کد ملی معتبر نیست."
-    return None
+def format_errors(errors):
+    return [f"❌ {message}" for message in errors.values()]
 
 def validate_student_inputs(data):
-    errors = []
-    if not re.fullmatch(r"\d{3}114150\d{2}", data["STID"]):
-        errors.append("❌ شماره دانشجویی باید مانند 40311415001 باشد.")
-    if error := validate_persian_name(data["Fname"], "نام"):
-        errors.append(error)
-    if error := validate_persian_name(data["Lname"], "نام خانوادگی"):
-        errors.append(error)
-    if error := validate_persian_name(data["Father"], "نام پدر"):
-        errors.append(error)
-    if not re.fullmatch(r"\d{6}[آ-ی]\d{2}", data["ids"]):
-        errors.append("❌ شماره شناسنامه باید شامل عدد ۶ رقمی، یک حرف فارسی و عدد ۲ رقمی باشد.")
-    if data["Borncity"] not in VALID_CITIES:
-        errors.append("❌ محل تولد باید یکی از مراکز استان باشد.")
-    if error := validate_birth_date(data["BIRTH"]):
-        errors.append(error)
-    if len(data["Address"]) > 100:
-        errors.append("❌ آدرس نباید بیشتر از ۱۰۰ کاراکتر باشد.")
-    if not re.fullmatch(r"\d{10}", data["Postalcode"]):
-        errors.append("❌ کد پستی باید ۱۰ رقمی باشد.")
-    if not re.fullmatch(r"98\d{10}", data["Cphone"]):
-        errors.append("❌ شماره موبایل باید با 98 شروع شده و ۱۲ رقمی باشد.")
-    if not re.fullmatch(r"0\d{2,3}\d{8}", data["Hphone"]):
-        errors.append("❌ شماره تلفن ثابت معتبر نیست.")
-    if data["Department"] not in VALID_DEPARTMENTS:
-        errors.append("❌ دانشکده معتبر نیست.")
-    if data["Major"] not in VALID_MAJORS[data["Department"]]:
-        errors.append("❌ رشته با دانشکده مطابقت ندارد.")
-    if data["Married"] not in ["مجرد", "متاهل"]:
-        errors.append("❌ وضعیت تأهل فقط می‌تواند مجرد یا متاهل باشد.")
-    if error := validate_national_id(data["Id"]):
-        errors.append(error)
-    return errors
+    return format_errors(validate_record(STUDENT_RULES, data))
 
 def validate_professor_inputs(data):
-    errors = []
-    if not re.fullmatch(r"\d{6}", data["LID"]):
-        errors.append("❌ کد استاد باید یک عدد ۶ رقمی باشد.")
-    if error := validate_persian_name(data["Fname"], "نام"):
-        errors.append(error)
-    if error := validate_persian_name(data["Lname"], "نام خانوادگی"):
-        errors.append(error)
-    if data["Department"] not in VALID_DEPARTMENTS:
-        errors.append("❌ دانشکده معتبر نیست.")
-    if data["Major"] not in VALID_MAJORS[data["Department"]]:
-        errors.append("❌ رشته با دانشکده مطابقت ندارد.")
-    if data["Borncity"] not in VALID_CITIES:
-        errors.append("❌ محل تولد باید یکی از مراکز استان باشد.")
-    if error := validate_birth_date(data["Birth"]):
-        errors.append(error)
-    if len(data["Address"]) > 100:
-        errors.append("❌ آدرس نباید بیشتر از ۱۰۰ کاراکتر باشد.")
-    if not re.fullmatch(r"\d{10}", data["Postalcode"]):
-        errors.append("❌ کد پستی باید ۱۰ رقمی باشد.")
-    if not re.fullmatch(r"98\d{10}", data["Cphone"]):
-        errors.append("❌ شماره موبایل باید با 98 شروع شده و ۱۲ رقمی باشد.")
-    if not re.fullmatch(r"0\d{2,3}\d{8}", data["Hphone"]):
-        errors.append("❌ شماره تلفن ثابت معتبر نیست.")
-    return errors
+    return format_errors(validate_record(PROFESSOR_RULES, data))
 
 def validate_course_inputs(data):
-    errors = []
-    if not data["CID"].isdigit() or not (10000 <= int(data["CID"]) <= 99999):
-        errors.append("❌ کد درس باید یک عدد ۵ رقمی باشد.")
-    if len(data["CName"]) > 25:
-        errors.append("❌ نام درس نباید بیشتر از ۲۵ کاراکتر باشد.")
-    if not re.fullmatch(r"^[آ-ی\s]+$", data["CName"]):
-        errors.append("❌ نام درس باید فقط شامل حروف فارسی باشد.")
-    if data["Department"] not in VALID_DEPARTMENTS:
-        errors.append("❌ دانشکده معتبر نیست.")
-    if data["Credit"] not in ["1","2","3","4"]:
-        errors.append("❌ تعداد واحد باید بین ۱ تا ۴ باشد.")
-    return errors
+    return format_errors(validate_record(COURSE_RULES, data))
 
 # منوی کناری
 st.sidebar.title("🎓 سامانه مدیریت دانشگاه")
 menu = st.sidebar.selectbox("انتخاب عملیات", [
     "افزودن دانشجو", "نمایش همه دانشجویان", "جستجو با شماره دانشجویی", "ویرایش دانشجو", "حذف دانشجو",
+    "ورود گروهی دانشجویان",
     "افزودن استاد", "نمایش همه اساتید", "جستجو با کد استاد", "ویرایش استاد", "حذف استاد",
     "افزودن درس", "نمایش همه دروس", "جستجو با کد درس", "ویرایش درس", "حذف درس"
 ])
 
 # توابع دریافت داده‌ها
-def get_all_students():
+def pick_record(path, label, empty_message):
+    # انتخاب‌گر با جستجو در سرور (پیشوند کد یا نام)؛ فقط PICKER_LIMIT گزینه دریافت می‌شود، نه کل جدول
+    query = st.text_input("جستجو با کد یا نام", key=f"picker:{path}").strip()
+    params = {"q": query, "limit": PICKER_LIMIT} if query else {"limit": PICKER_LIMIT}
     try:
-        res = requests.get(f"{BASE_URL}/students/")
-        res.raise_for_status()
-        return res.json()
+        items = get_json(f"{path}options", params)["items"]
     except requests.exceptions.RequestException as e:
         st.error(f"❌ خطا در دریافت داده‌ها: {e}")
-        return []
+        return None
+    if not items:
+        st.info("موردی با این جستجو یافت نشد." if query else empty_message)
+        return None
+    labels = {item["id"]: item["label"] for item in items}
+    return st.selectbox(label, labels, format_func=lambda item_id: f"{item_id} - {labels[item_id]}")
+
+def to_table(rows, columns):
+    return pd.DataFrame(rows, columns=list(columns)).rename(columns=columns)
+
+def person_filter_inputs():
+    with st.expander("فیلترها"):
+        department = st.selectbox("دانشکده", (ALL, *VALID_DEPARTMENTS))
+        majors = VALID_MAJORS[department] if department != ALL else tuple(chain.from_iterable(VALID_MAJORS.values()))
+        major = st.selectbox("رشته", (ALL, *majors))
+        borncity = st.selectbox("محل تولد", (ALL, *VALID_CITIES))
+    return {"department": department, "major": major, "borncity": borncity}
+
+def course_filter_inputs():
+    with st.expander("فیلترها"):
+        department = st.selectbox("دانشکده", (ALL, *VALID_DEPARTMENTS))
+    return {"department": department}
+
+def paged_table(path, columns, sortable, filters, empty_message):
+    # هر بار فقط یک صفحه از سرور خوانده می‌شود؛ مرتب‌سازی و فیلتر در خود پرس‌وجوی بک‌اند انجام می‌شود
+    filters = {name: value for name, value in filters.items() if value != ALL}
+    col1, col2, col3 = st.columns(3)
+    order_by = col1.selectbox("مرتب‌سازی بر اساس", sortable, format_func=columns.get)
+    desc = col2.selectbox("ترتیب", ("صعودی", "نزولی")) == "نزولی"
+    limit = col3.selectbox("تعداد در هر صفحه", PAGE_SIZES, index=1)
+
+    # صفحه‌بندی با cursor است، پس پشته cursor صفحه‌های قبلی نگه داشته می‌شود؛ تغییر مرتب‌سازی یا فیلتر از صفحه اول شروع می‌کند
+    query = {"order_by": order_by, "desc": desc, "limit": limit, **filters}
+    state = st.session_state.get(f"pages:{path}")
+    if state is None or state["query"] != query:
+        state = st.session_state[f"pages:{path}"] = {"query": query, "cursors": [None]}
+    cursors = state["cursors"]
 
-def get_all_professors():
     try:
-        res = requests.get(f"{BASE_URL}/professors/")
-        res.raise_for_status()
-        return res.json()
+        page = get_json(path, {**query, "cursor": cursors[-1]} if cursors[-1] else query)
+        total = get_json(f"{path}count", filters)["count"]
     except requests.exceptions.RequestException as e:
         st.error(f"❌ خطا در دریافت داده‌ها: {e}")
-        return []
+        return
+    if not page["items"]:
+        st.info("رکوردی با این فیلترها یافت نشد." if filters else empty_message)
+        return
+
+    st.dataframe(to_table(page["items"], columns), use_container_width=True)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    col1.button("صفحه قبل", disabled=len(cursors) == 1, on_click=cursors.pop)
+    col2.caption(f"صفحه {len(cursors)} از {max(1, -(-total // limit))} — {total} رکورد")
+    col3.button("صفحه بعد", disabled=not page["next_cursor"], on_click=cursors.append, args=(page["next_cursor"],))
+
+# ----------------- فرم‌ها و صفحه‌ها (st.form و st.fragment) -----------------
+# فیلدها داخل st.form هستند، پس تایپ کردن هیچ اجرای دوباره‌ای ایجاد نمی‌کند و داده فقط با دکمه ثبت ارسال می‌شود.
+# هر صفحه یک st.fragment است؛ تعامل با آن (جستجو، انتخاب رکورد، تغییر دانشکده، ثبت) فقط همان بخش را
+# دوباره اجرا می‌کند، نه منوی کناری و بقیه اسکریپت. دانشکده بیرون از فرم است تا فهرست رشته‌ها با تغییر آن به‌روز شود.
+
+def choice(label, options, value, **kwargs):
+    return st.selectbox(label, options, index=options.index(value) if value in options else 0, **kwargs)
+
+def student_form(key, record, submit_label):
+    department = choice("دانشکده", VALID_DEPARTMENTS, record.get("Department"), key=f"{key}:Department")
+    with st.form(key):
+        data = {
+            "STID": st.text_input("شماره دانشجویی", record.get("STID", ""), help="مانند 40311415001"),
+            "Fname": st.text_input("نام", record.get("Fname", "")),
+            "Lname": st.text_input("نام خانوادگی", record.get("Lname", "")),
+            "Father": st.text_input("نام پدر", record.get("Father", "")),
+            "ids": st.text_input("شماره شناسنامه", record.get("ids", ""), help="۶ رقم، یک حرف فارسی، ۲ رقم"),
+            "BIRTH": st.text_input("تاریخ تولد (YYYY/MM/DD)", record.get("BIRTH", "")),
+            "Address": st.text_area("آدرس", record.get("Address", "")),
+            "Postalcode": st.text_input("کد پستی", record.get("Postalcode", ""), help="۱۰ رقم"),
+            "Cphone": st.text_input("شماره موبایل", record.get("Cphone", ""), help="مثال: 989121234567"),
+            "Hphone": st.text_input("شماره تلفن ثابت", record.get("Hphone", ""), help="کد شهر + ۸ رقم"),
+            "Id": st.text_input("کد ملی", record.get("Id", ""), help="۱۰ رقم"),
+            "Borncity": choice("محل تولد", VALID_CITIES, record.get("Borncity")),
+            "Department": department,
+            "Major": choice("رشته", VALID_MAJORS[department], record.get("Major")),
+            "Married": choice("وضعیت تأهل", MARITAL_STATUSES, record.get("Married")),
+        }
+        submitted = st.form_submit_button(submit_label)
+    return data, submitted
+
+def professor_form(key, record, submit_label):
+    department = choice("دانشکده", VALID_DEPARTMENTS, record.get("Department"), key=f"{key}:Department")
+    with st.form(key):
+        data = {
+            "LID": st.text_input("کد استاد", record.get("LID", ""), help="۶ رقم"),
+            "Fname": st.text_input("نام", record.get("Fname", "")),
+            "Lname": st.text_input("نام خانوادگی", record.get("Lname", "")),
+            "Department": department,
+            "Major": choice("رشته", VALID_MAJORS[department], record.get("Major")),
+            "Borncity": choice("محل تولد", VALID_CITIES, record.get("Borncity")),
+            "Birth": st.text_input("تاریخ تولد (YYYY/MM/DD)", record.get("Birth", "")),
+            "Address": st.text_area("آدرس", record.get("Address", "")),
+            "Postalcode": st.text_input("کد پستی", record.get("Postalcode", ""), help="۱۰ رقم"),
+            "Cphone": st.text_input("شماره موبایل", record.get("Cphone", ""), help="مثال: 989121234567"),
+            "Hphone": st.text_input("شماره تلفن ثابت", record.get("Hphone", ""), help="کد شهر + ۸ رقم"),
+        }
+        submitted = st.form_submit_button(submit_label)
+    return data, submitted
+
+def course_form(key, record, submit_label):
+    with st.form(key):
+        data = {
+            "CID": st.text_input("کد درس", record.get("CID", ""), help="۵ رقم"),
+            "CName": st.text_input("نام درس", record.get("CName", "")),
+            "Department": choice("دانشکده", VALID_DEPARTMENTS, record.get("Department")),
+            "Credit": choice("تعداد واحد", CREDITS, record.get("Credit")),
+        }
+        submitted = st.form_submit_button(submit_label)
+    return data, submitted
+
+def show_errors(errors):
+    for error in errors:
+        st.warning(error)
+
+@st.fragment
+def add_page(path, form, validate, pk, duplicate_message, success_message):
+    data, submitted = form(f"add:{path}", {}, "ثبت")
+    if not submitted:
+        return
+    errors = validate(data)
+    if errors:
+        show_errors(errors)
+        return
+    try:
+        client.post(path, data)
+        st.success(success_message)
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 409:
+            st.error(duplicate_message.format(data[pk]))
+        else:
+            st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ خطا در ارتباط با سرور: {e}")
 
-def get_all_courses():
+@st.fragment
+def edit_page(path, form, validate, pk, duplicate_message, label, empty_message, success_message):
+    selected_id = pick_record(path, label, empty_message)
+    if selected_id is None:
+        return
     try:
-        res = requests.get(f"{BASE_URL}/courses/")
-        res.raise_for_status()
-        return res.json()
+        record = get_json(f"{path}{selected_id}")
     except requests.exceptions.RequestException as e:
         st.error(f"❌ خطا در دریافت داده‌ها: {e}")
-        return []
+        return
+    # the record id is part of the form key, so picking another record starts from its stored values
+    updated, submitted = form(f"edit:{path}{selected_id}", record, "ثبت تغییرات")
+    if not submitted:
+        return
+    errors = validate(updated)
+    if errors:
+        show_errors(errors)
+        return
+    try:
+        client.put(f"{path}{record[pk]}", updated)
+        st.success(success_message)
+    except requests.exceptions.HTTPError as e:
+        # 409: the new id belongs to another record
+        if e.response.status_code == 409:
+            st.error(duplicate_message.format(updated[pk]))
+        else:
+            st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ خطا در ارتباط با سرور: {e}")
+
+@st.fragment
+def delete_page(path, label, empty_message, success_message):
+    selected_id = pick_record(path, label, empty_message)
+    if selected_id is not None and st.button("حذف"):
+        try:
+            client.delete(f"{path}{selected_id}")
+            st.success(success_message)
+        except requests.exceptions.RequestException as e:
+            st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+
+@st.fragment
+def list_page(path, columns, sortable, filter_inputs, empty_message):
+    paged_table(path, columns, sortable, filter_inputs(), empty_message)
+
+@st.fragment
+def upload_page(path, columns, validate):
+    with st.form(f"upload:{path}"):
+        file = st.file_uploader("فایل CSV یا Excel", type=["csv", "xlsx"],
+                                help="سطر اول عنوان ستون‌هاست: نام فیلد (STID) یا عنوان فارسی آن (شماره دانشجویی)")
+        mode = st.selectbox("رکوردهای تکراری", UPLOAD_MODES, format_func=UPLOAD_MODES.get)
+        dry_run = st.checkbox("فقط بررسی، بدون ارسال به سرور")
+        submitted = st.form_submit_button("بررسی و ثبت")
+    if not submitted:
+        return
+    if file is None:
+        st.warning("❌ لطفاً یک فایل انتخاب کنید.")
+        return
+
+    # هر تکه جدا بررسی و ردیف‌های معتبرش بلافاصله ارسال می‌شوند؛ کل فایل هیچ‌وقت یکجا در حافظه نیست
+    counts = {"rows": 0, "valid": 0, "inserted": 0, "updated": 0, "skipped": 0}
+    errors = []
+    next_row = FIRST_DATA_ROW
+    progress = st.progress(0.0, text="در حال خواندن فایل...")
+    try:
+        for frame, done in read_chunks(file):
+            frame = normalize(frame, columns)
+            frame.index = pd.RangeIndex(next_row, next_row + len(frame))
+            next_row += len(frame)
+            valid, chunk_errors = validate(frame)
+            errors += chunk_errors
+            counts["rows"] += len(frame)
+            counts["valid"] += len(valid)
+            if not dry_run:
+                send_batches(path, valid, mode, counts, errors)
+            progress.progress(done, text=f"{counts['rows']} ردیف بررسی شد")
+    except READ_ERRORS as e:
+        st.error(f"❌ فایل قابل خواندن نیست: {e}")
+    except requests.exceptions.RequestException as e:
+        st.error(f"❌ خطا در ارتباط با سرور (ردیف‌های ثبت‌شده تا این لحظه باقی می‌مانند): {e}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("ردیف‌ها", counts["rows"])
+    col2.metric("معتبر", counts["valid"])
+    col3.metric("ثبت / به‌روزرسانی", f"{counts['inserted']} / {counts['updated']}")
+    col4.metric("ردیف‌های دارای خطا", len({error["row"] for error in errors}))
+    if counts["skipped"]:
+        st.info(f"{counts['skipped']} ردیف تکراری نادیده گرفته شد.")
+    if errors:
+        table = pd.DataFrame(sorted(errors, key=lambda error: error["row"])[:MAX_ERROR_ROWS], columns=list(ERROR_COLUMNS))
+        table["field"] = table["field"].map(lambda field: columns.get(field, field))
+        if len(errors) > MAX_ERROR_ROWS:
+            st.caption(f"فقط {MAX_ERROR_ROWS} خطای اول از {len(errors)} خطا نمایش داده می‌شود.")
+        st.dataframe(table.rename(columns=ERROR_COLUMNS), use_container_width=True, hide_index=True)
+    elif counts["rows"]:
+        st.success("✅ همه ردیف‌ها معتبر بودند." if dry_run else "✅ همه ردیف‌ها ثبت شدند.")
+
+def search_form(key, label):
+    with st.form(key):
+        value = st.text_input(label)
+        submitted = st.form_submit_button("جستجو")
+    return value, submitted
 
 # عملیات CRUD برای دانشجویان
 if menu == "افزودن دانشجو":
     st.subheader("➕ افزودن دانشجو")
-    data = {
-        "STID": st.text_input("شماره دانشجویی", help="مانند 40311415001"),
-        "Fname": st.text_input("نام"),
-        "Lname": st.text_input("نام خانوادگی"),
-        "Father": st.text_input("نام پدر"),
-        "ids": st.text_input("شماره شناسنامه", help="۶ رقم، یک حرف فارسی، ۲ رقم"),
-        "BIRTH": st.text_input("تاریخ تولد (YYYY/MM/DD)"),
-        "Address": st.text_area("آدرس"),
-        "Postalcode": st.text_input("کد پستی", help="۱۰ رقم"),
-        "Cphone": st.text_input("شماره موبایل", help="مثال: 989121234567"),
-        "Hphone": st.text_input("شماره تلفن ثابت", help="کد شهر + ۸ رقم"),
-        "Id": st.text_input("کد ملی", help="۱۰ رقم"),
-        "Borncity": st.selectbox("محل تولد", VALID_CITIES),
-        "Department": st.selectbox("دانشکده", VALID_DEPARTMENTS),
-    }
-    data["Major"] = st.selectbox("رشته", VALID_MAJORS[data["Department"]])
-    data["Married"] = st.selectbox("وضعیت تأهل", ["مجرد", "متاهل"])
-
-    if st.button("ثبت"):
-        errors = validate_student_inputs(data)
-        if errors:
-            for error in errors:
-                st.warning(error)
-        else:
-            try:
-                res = requests.post(f"{BASE_URL}/students/", json=data)
-                res.raise_for_status()
-                st.success("✅ دانشجو با موفقیت افزوده شد.")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 500:
-                    st.error(f"❌ دانشجویی با شماره دانشجویی {data['STID']} قبلاً ثبت شده است.")
-                else:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا در ارتباط با سرور: {e}")
+    add_page("/students/", student_form, validate_student_inputs, "STID",
+             "❌ دانشجویی با شماره دانشجویی {} قبلاً ثبت شده است.", "✅ دانشجو با موفقیت افزوده شد.")
 
 elif menu == "نمایش همه دانشجویان":
     st.subheader("📋 لیست دانشجویان")
-    data = get_all_students()
-    if data:
-        df = pd.DataFrame(data).sort_values(by="STID")
-        df = df.rename(columns={
-            "STID": "شماره دانشجویی",
-            "Fname": "نام",
-            "Lname": "نام خانوادگی",
-            "Father": "نام پدر",
-            "ids": "شماره شناسنامه",
-            "BIRTH": "تاریخ تولد",
-            "Id": "کد ملی",
-            "Address": "آدرس",
-            "Postalcode": "کد پستی",
-            "Cphone": "شماره موبایل",
-            "Hphone": "تلفن ثابت",
-            "Borncity": "محل تولد",
-            "Department": "دانشکده",
-            "Major": "رشته",
-            "Married": "وضعیت تأهل"
-        })
-        st.dataframe(
-            df[["شماره دانشجویی", "نام", "نام خانوادگی", "نام پدر", "شماره شناسنامه", 
-                "تاریخ تولد", "کد ملی", "آدرس", "کد پستی", "شماره موبایل", 
-                "تلفن ثابت", "محل تولد", "دانشکده", "رشته", "وضعیت تأهل"]],
-            use_container_width=True
-        )
-    else:
-        st.info("هیچ دانشجویی ثبت نشده است.")
+    list_page("/students/", STUDENT_COLUMNS, STUDENT_SORTABLE, person_filter_inputs, "هیچ دانشجویی ثبت نشده است.")
 
 elif menu == "جستجو با شماره دانشجویی":
     st.subheader("🔍 جستجو دانشجو با شماره")
-    stid = st.text_input("شماره دانشجویی")
-    if st.button("جستجو"):
+    stid, submitted = search_form("search:/students/", "شماره دانشجویی")
+    if submitted:
         if stid:
             try:
-                res = requests.get(f"{BASE_URL}/students/{stid}")
-                res.raise_for_status()
-                student = res.json()
-                df = pd.DataFrame([student])
-                df = df.rename(columns={
-                    "STID": "شماره دانشجویی",
-                    "Fname": "نام",
-                    "Lname": "نام خانوادگی",
-                    "Father": "نام پدر",
-                    "ids": "شماره شناسنامه",
-                    "BIRTH": "تاریخ تولد",
-                    "Id": "کد ملی",
-                    "Address": "آدرس",
-                    "Postalcode": "کد پستی",
-                    "Cphone": "شماره موبایل",
-                    "Hphone": "تلفن ثابت",
-                    "Borncity": "محل تولد",
-                    "Department": "دانشکده",
-                    "Major": "رشته",
-                    "Married": "وضعیت تأهل"
-                })
-                st.dataframe(
-                    df[["شماره دانشجویی", "نام", "نام خانوادگی", "نام پدر", "شماره شناسنامه", 
-                        "تاریخ تولد", "کد ملی", "آدرس", "کد پستی", "شماره موبایل", 
-                        "تلفن ثابت", "محل تولد", "دانشکده", "رشته", "وضعیت تأهل"]],
-                    use_container_width=True
-                )
+                student = get_json(f"/students/{stid}")
+                st.dataframe(to_table([student], STUDENT_COLUMNS), use_container_width=True)
                 st.markdown(f"""
                 ### اطلاعات دانشجو
                 - **شماره دانشجویی**: {student['STID']}
@@ -314,151 +401,37 @@ elif menu == "جستجو با شماره دانشجویی":
 
 elif menu == "ویرایش دانشجو":
     st.subheader("✏️ ویرایش اطلاعات دانشجو")
-    data = get_all_students()
-    if not data:
-        st.info("فعلاً هیچ دانشجویی ثبت نشده است.")
-    else:
-        options = [f"{s['STID']} - {s['Fname']} {s['Lname']}" for s in data]
-        selected = st.selectbox("یک دانشجو را انتخاب کنید", options)
-        student = next(s for s in data if f"{s['STID']} - {s['Fname']} {s['Lname']}" == selected)
-        updated = student.copy()
-
-        updated["STID"] = st.text_input("شماره دانشجویی", updated["STID"])
-        updated["Fname"] = st.text_input("نام", updated["Fname"])
-        updated["Lname"] = st.text_input("نام خانوادگی", updated["Lname"])
-        updated["Father"] = st.text_input("نام پدر", updated["Father"])
-        updated["ids"] = st.text_input("شماره شناسنامه", updated["ids"])
-        updated["BIRTH"] = st.text_input("تاریخ تولد (YYYY/MM/DD)", updated["BIRTH"])
-        updated["Address"] = st.text_area("آدرس", updated["Address"])
-        updated["Postalcode"] = st.text_input("کد پستی", updated["Postalcode"])
-        updated["Cphone"] = st.text_input("شماره موبایل", updated["Cphone"])
-        updated["Hphone"] = st.text_input("شماره تلفن ثابت", updated["Hphone"])
-        updated["Id"] = st.text_input("کد ملی", updated["Id"])
-        updated["Borncity"] = st.selectbox("محل تولد", VALID_CITIES, index=VALID_CITIES.index(updated["Borncity"]) if updated["Borncity"] in VALID_CITIES else 0)
-        updated["Department"] = st.selectbox("دانشکده", VALID_DEPARTMENTS, index=VALID_DEPARTMENTS.index(updated["Department"]) if updated["Department"] in VALID_DEPARTMENTS else 0)
-        updated["Major"] = st.selectbox("رشته", VALID_MAJORS[updated["Department"]], index=VALID_MAJORS[updated["Department"]].index(updated["Major"]) if updated["Major"] in VALID_MAJORS[updated["Department"]] else 0)
-        updated["Married"] = st.selectbox("وضعیت تأهل", ["مجرد", "متاهل"], index=["مجرد", "متاهل"].index(updated["Married"]) if updated["Married"] in ["مجرد", "متاهل"] else 0)
-
-        if st.button("ثبت تغییرات"):
-            errors = validate_student_inputs(updated)
-            if errors:
-                for error in errors:
-                    st.warning(error)
-            else:
-                try:
-                    res = requests.put(f"{BASE_URL}/students/{student['STID']}", json=updated)
-                    res.raise_for_status()
-                    st.success("✅ اطلاعات دانشجو با موفقیت ویرایش شد.")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    edit_page("/students/", student_form, validate_student_inputs, "STID",
+              "❌ دانشجویی با شماره دانشجویی {} قبلاً ثبت شده است.", "یک دانشجو را انتخاب کنید",
+              "فعلاً هیچ دانشجویی ثبت نشده است.", "✅ اطلاعات دانشجو با موفقیت ویرایش شد.")
 
 elif menu == "حذف دانشجو":
     st.subheader("🗑️ حذف دانشجو")
-    data = get_all_students()
-    if not data:
-        st.info("فعلاً هیچ دانشجویی ثبت نشده است.")
-    else:
-        options = [f"{s['STID']} - {s['Fname']} {s['Lname']}" for s in data]
-        selected = st.selectbox("یک دانشجو را برای حذف انتخاب کنید", options)
-        student = next(s for s in data if f"{s['STID']} - {s['Fname']} {s['Lname']}" == selected)
-        if st.button("حذف"):
-            try:
-                res = requests.delete(f"{BASE_URL}/students/{student['STID']}")
-                res.raise_for_status()
-                st.success("✅ دانشجو حذف شد.")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    delete_page("/students/", "یک دانشجو را برای حذف انتخاب کنید", "فعلاً هیچ دانشجویی ثبت نشده است.",
+                "✅ دانشجو حذف شد.")
+
+elif menu == "ورود گروهی دانشجویان":
+    st.subheader("📥 ورود گروهی دانشجویان از فایل")
+    upload_page("/students/", STUDENT_COLUMNS, validate_students)
 
 # عملیات CRUD برای اساتید
 elif menu == "افزودن استاد":
     st.subheader("➕ افزودن استاد")
-    data = {
-        "LID": st.text_input("کد استاد", help="۶ رقم"),
-        "Fname": st.text_input("نام"),
-        "Lname": st.text_input("نام خانوادگی"),
-        "Department": st.selectbox("دانشکده", VALID_DEPARTMENTS),
-        "Major": None,
-        "Borncity": st.selectbox("محل تولد", VALID_CITIES),
-        "Birth": st.text_input("تاریخ تولد (YYYY/MM/DD)"),
-        "Address": st.text_area("آدرس"),
-        "Postalcode": st.text_input("کد پستی", help="۱۰ رقم"),
-        "Cphone": st.text_input("شماره موبایل", help="مثال: 989121234567"),
-        "Hphone": st.text_input("شماره تلفن ثابت", help="کد شهر + ۸ رقم")
-    }
-    data["Major"] = st.selectbox("رشته", VALID_MAJORS[data["Department"]])
-
-    if st.button("ثبت"):
-        errors = validate_professor_inputs(data)
-        if errors:
-            for error in errors:
-                st.warning(error)
-        else:
-            try:
-                res = requests.post(f"{BASE_URL}/professors/", json=data)
-                res.raise_for_status()
-                st.success("✅ استاد با موفقیت افزوده شد.")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 500:
-                    st.error(f"❌ استادی با کد {data['LID']} قبلاً ثبت شده است.")
-                else:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا در ارتباط با سرور: {e}")
+    add_page("/professors/", professor_form, validate_professor_inputs, "LID",
+             "❌ استادی با کد {} قبلاً ثبت شده است.", "✅ استاد با موفقیت افزوده شد.")
 
 elif menu == "نمایش همه اساتید":
     st.subheader("📋 لیست اساتید")
-    data = get_all_professors()
-    if data:
-        df = pd.DataFrame(data).sort_values(by="LID")
-        df = df.rename(columns={
-            "LID": "کد استاد",
-            "Fname": "نام",
-            "Lname": "نام خانوادگی",
-            "Department": "دانشکده",
-            "Major": "رشته",
-            "Borncity": "محل تولد",
-            "Birth": "تاریخ تولد",
-            "Address": "آدرس",
-            "Postalcode": "کد پستی",
-            "Cphone": "شماره موبایل",
-            "Hphone": "تلفن ثابت"
-        })
-        st.dataframe(
-            df[["کد استاد", "نام", "نام خانوادگی", "دانشکده", "رشته", "محل تولد", 
-                "تاریخ تولد", "آدرس", "کد پستی", "شماره موبایل", "تلفن ثابت"]],
-            use_container_width=True
-        )
-    else:
-        st.info("هیچ استادی ثبت نشده است.")
+    list_page("/professors/", PROFESSOR_COLUMNS, PROFESSOR_SORTABLE, person_filter_inputs, "هیچ استادی ثبت نشده است.")
 
 elif menu == "جستجو با کد استاد":
     st.subheader("🔍 جستجو استاد با کد")
-    lid = st.text_input("کد استاد")
-    if st.button("جستجو"):
+    lid, submitted = search_form("search:/professors/", "کد استاد")
+    if submitted:
         if lid:
             try:
-                res = requests.get(f"{BASE_URL}/professors/{lid}")
-                res.raise_for_status()
-                professor = res.json()
-                df = pd.DataFrame([professor])
-                df = df.rename(columns={
-                    "LID": "کد استاد",
-                    "Fname": "نام",
-                    "Lname": "نام خانوادگی",
-                    "Department": "دانشکده",
-                    "Major": "رشته",
-                    "Borncity": "محل تولد",
-                    "Birth": "تاریخ تولد",
-                    "Address": "آدرس",
-                    "Postalcode": "کد پستی",
-                    "Cphone": "شماره موبایل",
-                    "Hphone": "تلفن ثابت"
-                })
-                st.dataframe(
-                    df[["کد استاد", "نام", "نام خانوادگی", "دانشکده", "رشته", "محل تولد", 
-                        "تاریخ تولد", "آدرس", "کد پستی", "شماره موبایل", "تلفن ثابت"]],
-                    use_container_width=True
-                )
+                professor = get_json(f"/professors/{lid}")
+                st.dataframe(to_table([professor], PROFESSOR_COLUMNS), use_container_width=True)
                 st.markdown(f"""
                 ### اطلاعات استاد
                 - **کد استاد**: {professor['LID']}
@@ -485,124 +458,33 @@ elif menu == "جستجو با کد استاد":
 
 elif menu == "ویرایش استاد":
     st.subheader("✏️ ویرایش اطلاعات استاد")
-    data = get_all_professors()
-    if not data:
-        st.info("فعلاً هیچ استادی ثبت نشده است.")
-    else:
-        options = [f"{p['LID']} - {p['Fname']} {p['Lname']}" for p in data]
-        selected = st.selectbox("یک استاد را انتخاب کنید", options)
-        professor = next(p for p in data if f"{p['LID']} - {p['Fname']} {p['Lname']}" == selected)
-        updated = professor.copy()
-
-        updated["LID"] = st.text_input("کد استاد", updated["LID"])
-        updated["Fname"] = st.text_input("نام", updated["Fname"])
-        updated["Lname"] = st.text_input("نام خانوادگی", updated["Lname"])
-        updated["Department"] = st.selectbox("دانشکده", VALID_DEPARTMENTS, index=VALID_DEPARTMENTS.index(updated["Department"]) if updated["Department"] in VALID_DEPARTMENTS else 0)
-        updated["Major"] = st.selectbox("رشته", VALID_MAJORS[updated["Department"]], index=VALID_MAJORS[updated["Department"]].index(updated["Major"]) if updated["Major"] in VALID_MAJORS[updated["Department"]] else 0)
-        updated["Borncity"] = st.selectbox("محل تولد", VALID_CITIES, index=VALID_CITIES.index(updated["Borncity"]) if updated["Borncity"] in VALID_CITIES else 0)
-        updated["Birth"] = st.text_input("تاریخ تولد (YYYY/MM/DD)", updated["Birth"])
-        updated["Address"] = st.text_area("آدرس", updated["Address"])
-        updated["Postalcode"] = st.text_input("کد پستی", updated["Postalcode"])
-        updated["Cphone"] = st.text_input("شماره موبایل", updated["Cphone"])
-        updated["Hphone"] = st.text_input("شماره تلفن ثابت", updated["Hphone"])
-
-        if st.button("ثبت تغییرات"):
-            errors = validate_professor_inputs(updated)
-            if errors:
-                for error in errors:
-                    st.warning(error)
-            else:
-                try:
-                    res = requests.put(f"{BASE_URL}/professors/{professor['LID']}", json=updated)
-                    res.raise_for_status()
-                    st.success("✅ اطلاعات استاد با موفقیت ویرایش شد.")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    edit_page("/professors/", professor_form, validate_professor_inputs, "LID",
+              "❌ استادی با کد {} قبلاً ثبت شده است.", "یک استاد را انتخاب کنید",
+              "فعلاً هیچ استادی ثبت نشده است.", "✅ اطلاعات استاد با موفقیت ویرایش شد.")
 
 elif menu == "حذف استاد":
     st.subheader("🗑️ حذف استاد")
-    data = get_all_professors()
-    if not data:
-        st.info("فعلاً هیچ استادی ثبت نشده است.")
-    else:
-        options = [f"{p['LID']} - {p['Fname']} {p['Lname']}" for p in data]
-        selected = st.selectbox("یک استاد را برای حذف انتخاب کنید", options)
-        professor = next(p for p in data if f"{p['LID']} - {p['Fname']} {p['Lname']}" == selected)
-        if st.button("حذف"):
-            try:
-                res = requests.delete(f"{BASE_URL}/professors/{professor['LID']}")
-                res.raise_for_status()
-                st.success("✅ استاد حذف شد.")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    delete_page("/professors/", "یک استاد را برای حذف انتخاب کنید", "فعلاً هیچ استادی ثبت نشده است.",
+                "✅ استاد حذف شد.")
 
 # عملیات CRUD برای دروس
 elif menu == "افزودن درس":
     st.subheader("➕ افزودن درس")
-    data = {
-        "CID": st.text_input("کد درس", help="۵ رقم"),
-        "CName": st.text_input("نام درس"),
-        "Department": st.selectbox("دانشکده", VALID_DEPARTMENTS),
-        "Credit": st.selectbox("تعداد واحد", ["1","2","3","4"])
-    }
-
-    if st.button("ثبت"):
-        errors = validate_course_inputs(data)
-        if errors:
-            for error in errors:
-                st.warning(error)
-        else:
-            try:
-                res = requests.post(f"{BASE_URL}/courses/", json=data)
-                res.raise_for_status()
-                st.success("✅ درس با موفقیت افزوده شد.")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 500:
-                    st.error(f"❌ درسی با کد {data['CID']} قبلاً ثبت شده است.")
-                else:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا در ارتباط با سرور: {e}")
-
+    add_page("/courses/", course_form, validate_course_inputs, "CID",
+             "❌ درسی با کد {} قبلاً ثبت شده است.", "✅ درس با موفقیت افزوده شد.")
 
 elif menu == "نمایش همه دروس":
     st.subheader("📋 لیست دروس")
-    data = get_all_courses()
-    if data:
-        df = pd.DataFrame(data).sort_values(by="CID")
-        df = df.rename(columns={
-            "CID": "کد درس",
-            "CName": "نام درس",
-            "Department": "دانشکده",
-            "Credit": "تعداد واحد"
-        })
-        st.dataframe(
-            df[["کد درس", "نام درس", "دانشکده", "تعداد واحد"]],
-            use_container_width=True
-        )
-    else:
-        st.info("هیچ درسی ثبت نشده است.")
+    list_page("/courses/", COURSE_COLUMNS, COURSE_SORTABLE, course_filter_inputs, "هیچ درسی ثبت نشده است.")
 
 elif menu == "جستجو با کد درس":
     st.subheader("🔍 جستجو درس با کد")
-    cid = st.text_input("کد درس")
-    if st.button("جستجو"):
+    cid, submitted = search_form("search:/courses/", "کد درس")
+    if submitted:
         if cid:
             try:
-                res = requests.get(f"{BASE_URL}/courses/{cid}")
-                res.raise_for_status()
-                course = res.json()
-                df = pd.DataFrame([course])
-                df = df.rename(columns={
-                    "CID": "کد درس",
-                    "CName": "نام درس",
-                    "Department": "دانشکده",
-                    "Credit": "تعداد واحد"
-                })
-                st.dataframe(
-                    df[["کد درس", "نام درس", "دانشکده", "تعداد واحد"]],
-                    use_container_width=True
-                )
+                course = get_json(f"/courses/{cid}")
+                st.dataframe(to_table([course], COURSE_COLUMNS), use_container_width=True)
                 st.markdown(f"""
                 ### اطلاعات درس
                 - **کد درس**: {course['CID']}
@@ -622,47 +504,10 @@ elif menu == "جستجو با کد درس":
 
 elif menu == "ویرایش درس":
     st.subheader("✏️ ویرایش اطلاعات درس")
-    data = get_all_courses()
-    if not data:
-        st.info("فعلاً هیچ درسی ثبت نشده است.")
-    else:
-        options = [f"{c['CID']} - {c['CName']}" for c in data]
-        selected = st.selectbox("یک درس را انتخاب کنید", options)
-        course = next(c for c in data if f"{c['CID']} - {c['CName']}" == selected)
-        updated = course.copy()
-
-        updated["CID"] = st.text_input("کد درس", updated["CID"])
-        updated["CName"] = st.text_input("نام درس", updated["CName"])
-        updated["Department"] = st.selectbox("دانشکده", VALID_DEPARTMENTS, index=VALID_DEPARTMENTS.index(updated["Department"]) if updated["Department"] in VALID_DEPARTMENTS else 0)
-        updated["Credit"] = st.selectbox("تعداد واحد", ["1", "2", "3", "4"], index=["1", "2", "3", "4"].index(updated["Credit"]) if updated["Credit"] in ["1", "2", "3", "4"] else 0)
-
-        if st.button("ثبت تغییرات"):
-            errors = validate_course_inputs(updated)
-            if errors:
-                for error in errors:
-                    st.warning(error)
-            else:
-                try:
-                    res = requests.put(f"{BASE_URL}/courses/{course['CID']}", json=updated)
-                    res.raise_for_status()
-                    st.success("✅ اطلاعات درس با موفقیت ویرایش شد.")
-
-                except requests.exceptions.RequestException as e:
-                    st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
+    edit_page("/courses/", course_form, validate_course_inputs, "CID",
+              "❌ درسی با کد {} قبلاً ثبت شده است.", "یک درس را انتخاب کنید",
+              "فعلاً هیچ درسی ثبت نشده است.", "✅ اطلاعات درس با موفقیت ویرایش شد.")
 
 elif menu == "حذف درس":
     st.subheader("🗑️ حذف درس")
-    data = get_all_courses()
-    if not data:
-        st.info("فعلاً هیچ درسی ثبت نشده است.")
-    else:
-        options = [f"{c['CID']} - {c['CName']}" for c in data]
-        selected = st.selectbox("یک درس را برای حذف انتخاب کنید", options)
-        course = next(c for c in data if f"{c['CID']} - {c['CName']}" == selected)
-        if st.button("حذف"):
-            try:
-                res = requests.delete(f"{BASE_URL}/courses/{course['CID']}")
-                res.raise_for_status()
-                st.success("✅ درس حذف شد.")
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ خطا: {e.response.json()['detail'] if e.response else e}")
\ No newline at end of file
+    delete_page("/courses/", "یک درس را برای حذف انتخاب کنید", "فعلاً هیچ درسی ثبت نشده است.", "✅ درس حذف شد.")
@@ -0,0 +1,170 @@
+import os
+from itertools import islice
+from zipfile import BadZipFile
+
+import numpy as np
+import pandas as pd
+
+import client
+from validation import (BIRTH_PATTERN, CITIES, CPHONE_PATTERN, DEPARTMENTS, HPHONE_PATTERN, IDS_PATTERN,
+                        MAJOR_DEPARTMENT, MARITAL_STATUSES, PERSIAN_TEXT_PATTERN, POSTALCODE_PATTERN,
+                        REQUIRED_MESSAGE, STID_PATTERN, STUDENT_RULES)
+
+try:
+    import openpyxl
+except ImportError:  # optional: only needed for .xlsx uploads
+    openpyxl = None
+
+# ----------------- ورود گروهی از فایل CSV/Excel -----------------
+# فایل تکه‌تکه (UPLOAD_CHUNK_SIZE ردیف) خوانده می‌شود و هر تکه با عملیات ستونی pandas بررسی می‌شود، نه ردیف‌به‌ردیف.
+# قواعد همان قواعد validation.py هستند؛ پیام خطا فقط برای خانه‌های نامعتبر با تابع check_* همان فیلد ساخته می‌شود.
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "5000"))
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", "1000"))
+# the first spreadsheet row is the header, so data row i is shown as row i + 2
+FIRST_DATA_ROW = 2
+REPEATED_DIGITS = [digit * 10 for digit in "0123456789"]
+# UnicodeDecodeError and pandas' ParserError are ValueErrors; a corrupt .xlsx is a BadZipFile
+READ_ERRORS = (ValueError, BadZipFile)
+
+
+def cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores digit-only cells as numbers
+        return str(int(value))
+    return str(value)
+
+
+def csv_chunks(file, chunk_size):
+    size = max(file.size, 1)
+    reader = pd.read_csv(file, dtype=str, keep_default_na=False, encoding="utf-8-sig", chunksize=chunk_size)
+    for frame in reader:
+        yield frame, min(file.tell() / size, 1.0)
+
+
+def excel_chunks(file, chunk_size):
+    # pandas.read_excel has no chunksize; openpyxl's read-only mode streams the sheet row by row
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = [cell_text(value).strip() for value in next(rows, ())]
+        total = max((sheet.max_row or 1) - 1, 1)
+        done = 0
+        while batch := list(islice(rows, chunk_size)):
+            done += len(batch)
+            frame = pd.DataFrame([[cell_text(value) for value in row] for row in batch], columns=header)
+            yield frame, min(done / total, 1.0)
+    finally:
+        workbook.close()
+
+
+def read_chunks(file, chunk_size=UPLOAD_CHUNK_SIZE):
+    name = file.name.lower()
+    if name.endswith(".csv"):
+        return csv_chunks(file, chunk_size)
+    if name.endswith(".xlsx"):
+        if openpyxl is None:
+            raise ValueError("برای خواندن فایل‌های xlsx بسته openpyxl باید نصب باشد.")
+        return excel_chunks(file, chunk_size)
+    raise ValueError("فقط فایل‌های csv و xlsx پشتیبانی می‌شوند.")
+
+
+def normalize(frame, labels):
+    # headers may be the field names (STID) or the labels shown in the tables (شماره دانشجویی)
+    names = {label: field for field, label in labels.items()}
+    frame = frame.rename(columns=lambda column: names.get(str(column).strip(), str(column).strip()))
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    return frame.reindex(columns=list(labels), fill_value="").astype(str).apply(lambda column: column.str.strip())
+
+
+# ----------------- بررسی ستونی -----------------
+# بررسی‌های ستونی می‌توانند از قواعد validation.py سخت‌گیرتر باشند (pandas با ستون‌های Arrow از RE2 استفاده می‌کند
+# که \d و \s آن فقط ASCII است) ولی هرگز آسان‌گیرتر نیستند؛ هر خانه رد شده دوباره با تابع check_* سنجیده می‌شود.
+
+def matches(column, pattern):
+    return column.str.fullmatch(pattern.pattern)
+
+
+def persian_name(column):
+    return (column.str.len() <= 10) & matches(column, PERSIAN_TEXT_PATTERN)
+
+
+def birth_date(column):
+    valid = matches(column, BIRTH_PATTERN)
+    dates = column.where(valid, "0000/00/00")
+    year, month, day = (dates.str.slice(start, end).astype(int) for start, end in ((0, 4), (5, 7), (8, 10)))
+    return (valid & year.between(1300, 1404) & month.between(1, 12) & (day >= 1)
+            & (day <= month.le(6).map({True: 31, False: 30})))
+
+
+def national_id(column):
+    # not NATIONAL_ID_PATTERN: its \d may match non-ASCII digits, and the checksum below needs ASCII bytes
+    valid = column.str.fullmatch(r"[0-9]{10}") & ~column.isin(REPEATED_DIGITS)
+    digits = column.where(valid, "0" * 10)
+    codes = np.frombuffer("".join(digits).encode("ascii"), dtype=np.uint8).reshape(-1, 10) - ord("0")
+    check = codes[:, :9].astype(np.int64) @ np.arange(10, 1, -1) % 11
+    expected = np.where(check < 2, check, 11 - check)
+    return valid & (codes[:, 9] == expected)
+
+
+STUDENT_CHECKS = {
+    "STID": lambda frame: matches(frame["STID"], STID_PATTERN),
+    "Fname": lambda frame: persian_name(frame["Fname"]),
+    "Lname": lambda frame: persian_name(frame["Lname"]),
+    "ids": lambda frame: matches(frame["ids"], IDS_PATTERN),
+    "Borncity": lambda frame: frame["Borncity"].isin(CITIES),
+    "Father": lambda frame: persian_name(frame["Father"]),
+    "BIRTH": lambda frame: birth_date(frame["BIRTH"]),
+    "Address": lambda frame: frame["Address"].str.len() <= 100,
+    "Postalcode": lambda frame: matches(frame["Postalcode"], POSTALCODE_PATTERN),
+    "Cphone": lambda frame: matches(frame["Cphone"], CPHONE_PATTERN),
+    "Hphone": lambda frame: matches(frame["Hphone"], HPHONE_PATTERN),
+    "Department": lambda frame: frame["Department"].isin(DEPARTMENTS),
+    "Major": lambda frame: frame["Major"].map(MAJOR_DEPARTMENT) == frame["Department"],
+    "Id": lambda frame: national_id(frame["Id"]),
+    "Married": lambda frame: frame["Married"].isin(MARITAL_STATUSES),
+}
+
+
+def validate_chunk(frame, checks, rules):
+    """frame is indexed by spreadsheet row; returns the valid rows and a list of {row, field, value, message}."""
+    errors = []
+    invalid_rows = set()
+    for field, check in checks.items():
+        column = frame[field]
+        missing = column == ""
+        failed = missing | ~check(frame).fillna(False)
+        for position in failed.to_numpy().nonzero()[0]:
+            value = column.iat[position]
+            if missing.iat[position]:
+                message = REQUIRED_MESSAGE
+            else:
+                message = rules[field](value, {"Department": frame["Department"].iat[position]})
+                if message is None:
+                    continue
+            invalid_rows.add(frame.index[position])
+            errors.append({"row": frame.index[position], "field": field, "value": value, "message": message})
+    return frame.drop(index=list(invalid_rows)), errors
+
+
+def validate_students(frame):
+    return validate_chunk(frame, STUDENT_CHECKS, STUDENT_RULES)
+
+
+# ----------------- ارسال گروهی -----------------
+
+def send_batches(path, frame, mode, counts, errors, batch_size=UPLOAD_BATCH_SIZE):
+    # rows the server rejects (e.g. a duplicate key with mode=insert) are mapped back to their spreadsheet row
+    for start in range(0, len(frame), batch_size):
+        batch = frame.iloc[start:start + batch_size]
+        result = client.send("POST", f"{path}bulk", params={"mode": mode}, json=batch.to_dict("records")).json()
+        for key in ("inserted", "updated", "skipped"):
+            counts[key] += result[key]
+        for failure in result["errors"]:
+            row = int(batch.index[failure["row"]])
+            for error in failure["errors"]:
+                value = batch.at[row, error["field"]] if error["field"] in batch else ""
+                errors.append({"row": row, "field": error["field"], "value": value, "message": error["message"]})